@@ -0,0 +1,282 @@
+"""
+Benchmarks for the game loop hot paths
+
+python benchmark.py physics
+python benchmark.py all --save baseline.json
+python benchmark.py all --compare baseline.json
+
+Every result is a cost in seconds per unit (per call, key, candidate, step or
+frame), so lower is better in every comparison.
+"""
+
+import argparse
+import contextlib
+import ctypes
+import io
+import json
+import os
+import platform
+import random
+import time
+
+# Draw into an off-screen surface, benchmarks never open a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import secp256k1 as ice
+from visual import (AddressSearcher, Ball, BallGame, PhysicsWorld, BALL_RADIUS, INITIAL_BALL_COUNT,
+                    SCREEN_WIDTH, SCREEN_HEIGHT)
+
+SUITES = ('wrappers', 'search', 'physics', 'draw')
+PHYSICS_COUNTS = (72, 200, 500, 1000, 2000, 5000, 10000)
+ALL_PAIRS_LIMIT = 2000  # All pairs needs count^2 / 2 index pairs in memory
+SEARCH_SEEDS = (1, 2, 3)
+BATCH = 4608  # Candidates of one frame
+
+
+def make_world(count, broad_phase=None):
+    """World of count balls at the ball density of the default game"""
+    area = SCREEN_WIDTH * SCREEN_HEIGHT / INITIAL_BALL_COUNT * count
+    height = int((area * SCREEN_HEIGHT / SCREEN_WIDTH) ** 0.5)
+    width = int(area / height)
+    balls = [
+        Ball(x=random.randint(50, width - 50),
+             y=random.randint(50, height - 50),
+             radius=BALL_RADIUS,
+             velocity_range=[-1, 1])
+        for _ in range(count)
+    ]
+    return PhysicsWorld(balls, width, height, broad_phase)
+
+
+def time_steps(world, steps, warmup=10):
+    """Seconds per PhysicsWorld.step"""
+    for _ in range(warmup):
+        world.step()
+    start = time.perf_counter()
+    for _ in range(steps):
+        world.step()
+    return (time.perf_counter() - start) / steps
+
+
+def time_call(func, min_time=0.05, repeat=5):
+    """Seconds per call of func, best of repeat runs of at least min_time each"""
+    func()
+    best = None
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best or elapsed / calls, elapsed / calls)
+    return best
+
+
+def bench_wrappers():
+    """Cost per key of the secp256k1 wrappers on the search path"""
+    base = (1 << 71) + random.getrandbits(71)
+    keys = [base + i for i in range(BATCH)]
+    pubkey = ice.scalar_multiplication(base)
+    pubkeys = ice.scalar_multiplications(keys)
+    # Caller owned buffers for the _into variants
+    pubkey_buffer = bytearray(pubkeys)
+    addends = bytearray(ice.scalar_multiplications([key + BATCH for key in keys]))
+    point_out = bytearray(len(pubkeys))
+    h160_out = bytearray(20 * BATCH)
+    h160s = ice.pubkeys_to_h160(0, True, pubkeys)
+    # A ctypes array written at an offset, the hashes must land right after the first 20 bytes
+    c_out = ctypes.create_string_buffer(20 * BATCH + 40)
+    ice.pubkeys_to_h160_into(0, True, pubkey_buffer, BATCH, c_out, 20)
+    if c_out.raw[20:20 + 20 * BATCH] != h160s or c_out.raw[:20] != bytes(20):
+        raise RuntimeError("pubkeys_to_h160_into wrote outside its ctypes output slice")
+    bloom_bits, bloom_hashes, bloom_filter = ice.Fill_in_bloom_batch(h160s, 20)[:3]
+    return {
+        'privatekey_to_address': time_call(lambda: ice.privatekey_to_address(0, True, base)),
+        'privatekey_to_h160': time_call(lambda: ice.privatekey_to_h160(0, True, base)),
+        'scalar_multiplication': time_call(lambda: ice.scalar_multiplication(base)),
+        'scalar_multiplications': time_call(lambda: ice.scalar_multiplications(keys)) / BATCH,
+        'privatekey_loop_h160_sse': time_call(lambda: ice.privatekey_loop_h160_sse(BATCH, 0, True, base)) / BATCH,
+        'pubkey_to_h160': time_call(lambda: ice.pubkey_to_h160(0, True, pubkey)),
+        'pubkeys_to_h160': time_call(lambda: ice.pubkeys_to_h160(0, True, pubkeys)) / BATCH,
+        'pubkeys_to_h160_into': time_call(
+            lambda: ice.pubkeys_to_h160_into(0, True, pubkey_buffer, BATCH, h160_out)) / BATCH,
+        'pubkeys_to_h160_into_ctypes': time_call(
+            lambda: ice.pubkeys_to_h160_into(0, True, pubkey_buffer, BATCH, c_out, 20)) / BATCH,
+        'point_vector_addition': time_call(
+            lambda: ice.point_vector_addition(BATCH, bytes(pubkey_buffer), bytes(addends))) / BATCH,
+        'point_vector_addition_into': time_call(
+            lambda: ice.point_vector_addition_into(BATCH, pubkey_buffer, addends, point_out)) / BATCH,
+        'check_in_bloom': time_call(lambda: ice.check_in_bloom(h160s[:20], bloom_bits, bloom_hashes, bloom_filter)),
+        'bloom_batch_check_add': time_call(
+            lambda: ice.bloom_batch_check_add(h160s, 20, bloom_bits, bloom_hashes, bloom_filter)) / BATCH,
+        'Fill_in_bloom': time_call(
+            lambda: ice.Fill_in_bloom([h160s[i:i + 20] for i in range(0, len(h160s), 20)])) / BATCH,
+        'Fill_in_bloom_batch': time_call(lambda: ice.Fill_in_bloom_batch(h160s, 20)) / BATCH,
+    }
+
+
+def bench_search(seeds=SEARCH_SEEDS, iterations=20):
+    """Cost per candidate of search_bitcoin_address over seeded headless games"""
+    results = {}
+    for seed in seeds:
+        game = BallGame(headless=True, seed=seed)
+        elapsed = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(iterations):
+                game.update_physics()
+                start = time.perf_counter()
+                game.search_bitcoin_address()
+                elapsed += time.perf_counter() - start
+                game.iteration += 1
+        results[f'seed_{seed}'] = elapsed / max(game.searcher.generated, 1)
+    results['deduplicated'] = bench_deduplicated(iterations)
+    return results
+
+
+def bench_deduplicated(iterations=20):
+    """Cost per candidate of frames whose keys were all tested already
+    
+    A bit rotation of a frame is a different frame with the same key set, so
+    after the first search every frame is skipped by the dedup cache.
+    """
+    frame = format(random.getrandbits(INITIAL_BALL_COUNT), f'0{INITIAL_BALL_COUNT}b')
+    searcher = AddressSearcher(dedup_size=100000)
+    searcher.search(frame)
+    hashed = searcher.hashed
+    start = time.perf_counter()
+    for i in range(1, iterations + 1):
+        searcher.search(frame[i:] + frame[:i])
+    elapsed = time.perf_counter() - start
+    if searcher.hashed != hashed:
+        raise RuntimeError("deduplicated frames were hashed again")
+    return elapsed / (searcher.generated - searcher.generated // (iterations + 1))
+
+
+def bench_physics(counts=PHYSICS_COUNTS, steps=200):
+    """Physics cost per step against ball count, grid and all pairs broad phase"""
+    results = {}
+    for count in counts:
+        grid = time_steps(make_world(count, 'grid'), steps)
+        all_pairs = None
+        if count <= ALL_PAIRS_LIMIT:
+            all_pairs = time_steps(make_world(count, 'all'), steps)
+        results[count] = {'grid': grid, 'all': all_pairs}
+    return results
+
+
+def bench_draw(frames=200, seed=1):
+    """Cost per BallGame.draw with the dummy video driver, full and dirty rect frames"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = BallGame(seed=seed)
+    game.draw()
+    dirty = 0
+    for _ in range(frames):
+        game.update_physics()
+        start = time.perf_counter()
+        game.draw()
+        dirty += time.perf_counter() - start
+    dirty /= frames
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.renderer.full_redraw = True
+        game.draw()
+    full = (time.perf_counter() - start) / frames
+    return {'dirty': dirty, 'full': full}
+
+
+def print_physics(results):
+    print(f"{'balls':>8} {'grid ms/step':>14} {'all pairs ms/step':>18}")
+    for count, row in results.items():
+        all_pairs = f"{row['all'] * 1000:18.3f}" if row['all'] is not None else f"{'-':>18}"
+        print(f"{count:>8} {row['grid'] * 1000:14.3f} {all_pairs}")
+
+
+def print_wrappers(results):
+    print(f"{'wrapper (per key)':<28} {'us':>10} {'calls/s':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<28} {seconds * 1e6:10.2f} {1 / seconds:12,.0f}")
+
+
+def print_search(results):
+    print(f"{'search':<12} {'us/candidate':>14} {'candidates/s':>14}")
+    for name, seconds in results.items():
+        print(f"{name:<12} {seconds * 1e6:14.2f} {1 / seconds:14,.0f}")
+
+
+def print_draw(results):
+    for name, seconds in results.items():
+        print(f"draw {name:<8} {seconds * 1000:8.3f} ms/frame")
+
+
+def flatten(results, prefix=''):
+    """Dotted names of every number in a nested result dict"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif value is not None:
+            flat[name] = value
+    return flat
+
+
+def compare(results, baseline, threshold=0.1):
+    """Print every result against the baseline, returns the names slower by more than threshold"""
+    current = flatten(results)
+    previous = flatten(baseline['results'])
+    slower = []
+    print(f"{'benchmark':<40} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, seconds in current.items():
+        if name not in previous:
+            continue
+        change = seconds / previous[name] - 1
+        print(f"{name:<40} {previous[name]:12.3e} {seconds:12.3e} {change:+8.1%}")
+        if change > threshold:
+            slower.append(name)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the game loop hot paths")
+    parser.add_argument('suite', choices=SUITES + ('all',), help="benchmark to run")
+    parser.add_argument('--steps', type=int, default=200, help="physics steps timed per ball count")
+    parser.add_argument('--seed', type=int, default=1, help="random seed for ball placement")
+    parser.add_argument('--save', metavar='FILE', help="save the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='FILE', help="compare the results with a saved baseline")
+    parser.add_argument('--threshold', type=float, default=10,
+                        help="percent slower than the baseline that counts as a regression")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    suites = SUITES if args.suite == 'all' else (args.suite,)
+    results = {}
+    if 'wrappers' in suites:
+        results['wrappers'] = bench_wrappers()
+        print_wrappers(results['wrappers'])
+    if 'search' in suites:
+        results['search'] = bench_search()
+        print_search(results['search'])
+    if 'physics' in suites:
+        results['physics'] = bench_physics(steps=args.steps)
+        print_physics(results['physics'])
+    if 'draw' in suites:
+        results['draw'] = bench_draw(seed=args.seed)
+        print_draw(results['draw'])
+    
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'machine': platform.platform(), 'python': platform.python_version(),
+                       'results': results}, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            slower = compare(results, json.load(file), args.threshold / 100)
+        if slower:
+            print(f"{len(slower)} benchmarks more than {args.threshold:g}% slower than the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,28 +15,6 @@ import pickle
 N = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
 Zero=b'\x04\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
 #==============================================================================
-if platform.system().lower().startswith('win'):
-    dir_path = os.path.dirname(os.path.realpath(__file__))
-    
-    dllfile = dir_path + '/ice_secp256k1.dll'
-    if os.path.isfile(dllfile) == True:
-        pathdll = os.path.realpath(dllfile)
-        ice = ctypes.CDLL(pathdll)
-    else:
-        print('File {} not found'.format(dllfile))
-    
-elif platform.system().lower().startswith('lin'):
-    dir_path = os.path.dirname(os.path.realpath(__file__))
-    dllfile = dir_path + '/ice_secp256k1.so'
-    if os.path.isfile(dllfile) == True:
-        pathdll = os.path.realpath(dllfile)
-        ice = ctypes.CDLL(pathdll)
-    else:
-        print('File {} not found'.format(dllfile))
-    
-else:
-    print('[-] Unsupported Platform currently for ctypes dll method. Only [Windows and Linux] is working')
-    sys.exit()
 ###############################################################################
 #==============================================================================
 # Coin type
@@ -92,117 +70,155 @@ COIN_DNR  =	48
 COIN_BWK  =	49
 
 #==============================================================================
-ice.scalar_multiplication.argtypes = [ctypes.c_char_p, ctypes.c_char_p]   # pvk,ret
-#==============================================================================
-ice.scalar_multiplications.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p]  # pvk,len,ret
-#==============================================================================
-ice.get_x_to_y.argtypes = [ctypes.c_char_p, ctypes.c_bool, ctypes.c_char_p]   # x,even,ret
-#==============================================================================
-ice.point_increment.argtypes = [ctypes.c_char_p, ctypes.c_char_p] # upub,ret
-#==============================================================================
-ice.point_negation.argtypes = [ctypes.c_char_p, ctypes.c_char_p]  # upub,ret
-#==============================================================================
-ice.point_doubling.argtypes = [ctypes.c_char_p, ctypes.c_char_p]  # upub,ret
-#==============================================================================
-ice.privatekey_to_coinaddress.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_bool, ctypes.c_char_p]  # intcoin,012,comp,pvk
-ice.privatekey_to_coinaddress.restype = ctypes.c_void_p
-#==============================================================================
-ice.privatekey_to_address.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p]  # 012,comp,pvk
-ice.privatekey_to_address.restype = ctypes.c_void_p
-#==============================================================================
-ice.hash_to_address.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p]  # 012,comp,hash
-ice.hash_to_address.restype = ctypes.c_void_p
-#==============================================================================
-ice.pubkey_to_address.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p]  # 012,comp,upub
-ice.pubkey_to_address.restype = ctypes.c_void_p
-#==============================================================================
-ice.privatekey_to_h160.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p, ctypes.c_char_p]  # 012,comp,pvk,ret
-#==============================================================================
-ice.privatekey_loop_h160.argtypes = [ctypes.c_ulonglong, ctypes.c_int, ctypes.c_bool, ctypes.c_char_p, ctypes.c_char_p]  # num,012,comp,pvk,ret
-#==============================================================================
-ice.privatekey_loop_h160_sse.argtypes = [ctypes.c_ulonglong, ctypes.c_int, ctypes.c_bool, ctypes.c_char_p, ctypes.c_char_p]  # num,012,comp,pvk,ret
-#==============================================================================
-ice.pubkey_to_h160.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p, ctypes.c_char_p]  # 012,comp,upub,ret
-#==============================================================================
-ice.pbkdf2_hmac_sha512_dll.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int] # ret, words, len
-#==============================================================================
-ice.pbkdf2_hmac_sha512_list.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulonglong, ctypes.c_int, ctypes.c_ulonglong] # ret,words,len,mnem_size,total 
-#==============================================================================
-ice.pub_endo1.argtypes = [ctypes.c_char_p, ctypes.c_char_p]  # upub,ret
-#==============================================================================
-ice.pub_endo2.argtypes = [ctypes.c_char_p, ctypes.c_char_p]  # upub,ret
-#==============================================================================
-ice.b58_encode.argtypes = [ctypes.c_char_p]  # _h
-ice.b58_encode.restype = ctypes.c_void_p
-#==============================================================================
-ice.b58_decode.argtypes = [ctypes.c_char_p]  # addr
-ice.b58_decode.restype = ctypes.c_void_p
-#==============================================================================
-ice.bech32_address_decode.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_char_p]  # coin,b32_addr,h160
-#==============================================================================
-ice.get_sha256.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p] # input, len, ret
-#==============================================================================
-ice.create_baby_table.argtypes = [ctypes.c_ulonglong, ctypes.c_ulonglong, ctypes.c_char_p] # start,end,ret
-#==============================================================================
-ice.point_addition.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # upub1,upub2,ret
-#==============================================================================
-ice.point_subtraction.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # upub1,upub2,ret
-#==============================================================================
-ice.point_loop_subtraction.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # k,upub1,upub2,ret
-#==============================================================================
-ice.point_loop_addition.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # k,upub1,upub2,ret
-#==============================================================================
-ice.point_vector_addition.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # num,upubs1,upubs2,ret
-#==============================================================================
-ice.point_sequential_increment_P2.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p] # num,upub1,ret
-#==============================================================================
-ice.point_sequential_increment_P2_mcpu.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p] # num,upub1,mcpu,ret
-#==============================================================================
-ice.point_sequential_increment.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p] # num,upub1,ret
-#==============================================================================
-ice.point_sequential_decrement.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p] # num,upub1,ret
-#==============================================================================
-ice.pubkeyxy_to_ETH_address.argtypes = [ctypes.c_char_p] # upub_xy
-ice.pubkeyxy_to_ETH_address.restype = ctypes.c_void_p
-#==============================================================================
-ice.pubkeyxy_to_ETH_address_bytes.argtypes = [ctypes.c_char_p, ctypes.c_char_p] # upub_xy, ret
-#==============================================================================
-ice.privatekey_to_ETH_address.argtypes = [ctypes.c_char_p] # pvk
-ice.privatekey_to_ETH_address.restype = ctypes.c_void_p
-#==============================================================================
-ice.privatekey_to_ETH_address_bytes.argtypes = [ctypes.c_char_p, ctypes.c_char_p] # pvk, ret
-#==============================================================================
-ice.privatekey_group_to_ETH_address.argtypes = [ctypes.c_char_p, ctypes.c_int] # pvk, m
-ice.privatekey_group_to_ETH_address.restype = ctypes.c_void_p
-#==============================================================================
-ice.privatekey_group_to_ETH_address_bytes.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p] # pvk,m,ret
-#==============================================================================
-ice.init_P2_Group.argtypes = [ctypes.c_char_p] # upub
-#==============================================================================
-ice.free_memory.argtypes = [ctypes.c_void_p] # pointer
-#==============================================================================
-ice.bloom_check_add.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_ulonglong, ctypes.c_ubyte, ctypes.c_char_p] #buff, len, 0_1, _bits, _hashes, _bf
-ice.bloom_check_add.restype = ctypes.c_int
-#==============================================================================
-ice.bloom_batch_add.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_ulonglong, ctypes.c_ubyte, ctypes.c_char_p] #chunk, buff, len, 0_1, _bits, _hashes, _bf
-#==============================================================================
-ice.bloom_check_add_mcpu.argtypes = [ctypes.c_void_p, ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulonglong, ctypes.c_ubyte, ctypes.c_char_p] #buff, num_items, found_array, len, mcpu, 0_1, _bits, _hashes, _bf
-#==============================================================================
-ice.test_bit_set_bit.argtypes = [ctypes.c_char_p, ctypes.c_ulonglong, ctypes.c_int] #_bf, _bits, 0_1
-#==============================================================================
-ice.create_bsgs_bloom_mcpu.argtypes = [ctypes.c_int, ctypes.c_ulonglong, ctypes.c_ulonglong, ctypes.c_ubyte, ctypes.c_char_p] #mcpu, num_items, _bits, _hashes, _bf
-#==============================================================================
-ice.bsgs_2nd_check_prepare.argtypes = [ctypes.c_ulonglong] # bP_elem
-#==============================================================================
-ice.bsgs_2nd_check.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulonglong, ctypes.c_char_p] # upub, z1, bP_elem, ret
-ice.bsgs_2nd_check.restype = ctypes.c_bool #True or False
-#==============================================================================
-ice.Load_data_to_memory.argtypes = [ctypes.c_char_p, ctypes.c_bool] #sorted_bin_file_h160, verbose
-#==============================================================================
-ice.check_collision.argtypes = [ctypes.c_char_p] #h160
-ice.check_collision.restype = ctypes.c_bool #True or False
+def _load_library():
+    ''' Load the shared library, declare the function types and initialise it.
+    Runs on the first use of ice, so importing this module stays cheap. '''
+    global ice
+    if platform.system().lower().startswith('win'):
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+    
+        dllfile = dir_path + '/ice_secp256k1.dll'
+        if os.path.isfile(dllfile) == True:
+            pathdll = os.path.realpath(dllfile)
+            ice = ctypes.CDLL(pathdll)
+        else:
+            print('File {} not found'.format(dllfile))
+            sys.exit()
+    
+    elif platform.system().lower().startswith('lin'):
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        dllfile = dir_path + '/ice_secp256k1.so'
+        if os.path.isfile(dllfile) == True:
+            pathdll = os.path.realpath(dllfile)
+            ice = ctypes.CDLL(pathdll)
+        else:
+            print('File {} not found'.format(dllfile))
+            sys.exit()
+    
+    else:
+        print('[-] Unsupported Platform currently for ctypes dll method. Only [Windows and Linux] is working')
+        sys.exit()
+    #==============================================================================
+    ice.scalar_multiplication.argtypes = [ctypes.c_char_p, ctypes.c_char_p]   # pvk,ret
+    #==============================================================================
+    ice.scalar_multiplications.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p]  # pvk,len,ret
+    #==============================================================================
+    ice.get_x_to_y.argtypes = [ctypes.c_char_p, ctypes.c_bool, ctypes.c_char_p]   # x,even,ret
+    #==============================================================================
+    ice.point_increment.argtypes = [ctypes.c_char_p, ctypes.c_char_p] # upub,ret
+    #==============================================================================
+    ice.point_negation.argtypes = [ctypes.c_char_p, ctypes.c_char_p]  # upub,ret
+    #==============================================================================
+    ice.point_doubling.argtypes = [ctypes.c_char_p, ctypes.c_char_p]  # upub,ret
+    #==============================================================================
+    ice.privatekey_to_coinaddress.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_bool, ctypes.c_char_p]  # intcoin,012,comp,pvk
+    ice.privatekey_to_coinaddress.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.privatekey_to_address.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p]  # 012,comp,pvk
+    ice.privatekey_to_address.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.hash_to_address.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p]  # 012,comp,hash
+    ice.hash_to_address.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.pubkey_to_address.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p]  # 012,comp,upub
+    ice.pubkey_to_address.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.privatekey_to_h160.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p, ctypes.c_char_p]  # 012,comp,pvk,ret
+    #==============================================================================
+    ice.privatekey_loop_h160.argtypes = [ctypes.c_ulonglong, ctypes.c_int, ctypes.c_bool, ctypes.c_char_p, ctypes.c_char_p]  # num,012,comp,pvk,ret
+    #==============================================================================
+    ice.privatekey_loop_h160_sse.argtypes = [ctypes.c_ulonglong, ctypes.c_int, ctypes.c_bool, ctypes.c_char_p, ctypes.c_char_p]  # num,012,comp,pvk,ret
+    #==============================================================================
+    ice.pubkey_to_h160.argtypes = [ctypes.c_int, ctypes.c_bool, ctypes.c_char_p, ctypes.c_char_p]  # 012,comp,upub,ret
+    #==============================================================================
+    ice.pbkdf2_hmac_sha512_dll.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int] # ret, words, len
+    #==============================================================================
+    ice.pbkdf2_hmac_sha512_list.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulonglong, ctypes.c_int, ctypes.c_ulonglong] # ret,words,len,mnem_size,total 
+    #==============================================================================
+    ice.pub_endo1.argtypes = [ctypes.c_char_p, ctypes.c_char_p]  # upub,ret
+    #==============================================================================
+    ice.pub_endo2.argtypes = [ctypes.c_char_p, ctypes.c_char_p]  # upub,ret
+    #==============================================================================
+    ice.b58_encode.argtypes = [ctypes.c_char_p]  # _h
+    ice.b58_encode.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.b58_decode.argtypes = [ctypes.c_char_p]  # addr
+    ice.b58_decode.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.bech32_address_decode.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_char_p]  # coin,b32_addr,h160
+    #==============================================================================
+    ice.get_sha256.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p] # input, len, ret
+    #==============================================================================
+    ice.create_baby_table.argtypes = [ctypes.c_ulonglong, ctypes.c_ulonglong, ctypes.c_char_p] # start,end,ret
+    #==============================================================================
+    ice.point_addition.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # upub1,upub2,ret
+    #==============================================================================
+    ice.point_subtraction.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # upub1,upub2,ret
+    #==============================================================================
+    ice.point_loop_subtraction.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # k,upub1,upub2,ret
+    #==============================================================================
+    ice.point_loop_addition.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # k,upub1,upub2,ret
+    #==============================================================================
+    ice.point_vector_addition.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p] # num,upubs1,upubs2,ret
+    #==============================================================================
+    ice.point_sequential_increment_P2.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p] # num,upub1,ret
+    #==============================================================================
+    ice.point_sequential_increment_P2_mcpu.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p] # num,upub1,mcpu,ret
+    #==============================================================================
+    ice.point_sequential_increment.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p] # num,upub1,ret
+    #==============================================================================
+    ice.point_sequential_decrement.argtypes = [ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_char_p] # num,upub1,ret
+    #==============================================================================
+    ice.pubkeyxy_to_ETH_address.argtypes = [ctypes.c_char_p] # upub_xy
+    ice.pubkeyxy_to_ETH_address.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.pubkeyxy_to_ETH_address_bytes.argtypes = [ctypes.c_char_p, ctypes.c_char_p] # upub_xy, ret
+    #==============================================================================
+    ice.privatekey_to_ETH_address.argtypes = [ctypes.c_char_p] # pvk
+    ice.privatekey_to_ETH_address.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.privatekey_to_ETH_address_bytes.argtypes = [ctypes.c_char_p, ctypes.c_char_p] # pvk, ret
+    #==============================================================================
+    ice.privatekey_group_to_ETH_address.argtypes = [ctypes.c_char_p, ctypes.c_int] # pvk, m
+    ice.privatekey_group_to_ETH_address.restype = ctypes.c_void_p
+    #==============================================================================
+    ice.privatekey_group_to_ETH_address_bytes.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p] # pvk,m,ret
+    #==============================================================================
+    ice.init_P2_Group.argtypes = [ctypes.c_char_p] # upub
+    #==============================================================================
+    ice.free_memory.argtypes = [ctypes.c_void_p] # pointer
+    #==============================================================================
+    ice.bloom_check_add.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_ulonglong, ctypes.c_ubyte, ctypes.c_char_p] #buff, len, 0_1, _bits, _hashes, _bf
+    ice.bloom_check_add.restype = ctypes.c_int
+    #==============================================================================
+    ice.bloom_batch_add.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_ulonglong, ctypes.c_ubyte, ctypes.c_char_p] #chunk, buff, len, 0_1, _bits, _hashes, _bf
+    #==============================================================================
+    ice.bloom_check_add_mcpu.argtypes = [ctypes.c_void_p, ctypes.c_ulonglong, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulonglong, ctypes.c_ubyte, ctypes.c_char_p] #buff, num_items, found_array, len, mcpu, 0_1, _bits, _hashes, _bf
+    #==============================================================================
+    ice.test_bit_set_bit.argtypes = [ctypes.c_char_p, ctypes.c_ulonglong, ctypes.c_int] #_bf, _bits, 0_1
+    #==============================================================================
+    ice.create_bsgs_bloom_mcpu.argtypes = [ctypes.c_int, ctypes.c_ulonglong, ctypes.c_ulonglong, ctypes.c_ubyte, ctypes.c_char_p] #mcpu, num_items, _bits, _hashes, _bf
+    #==============================================================================
+    ice.bsgs_2nd_check_prepare.argtypes = [ctypes.c_ulonglong] # bP_elem
+    #==============================================================================
+    ice.bsgs_2nd_check.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulonglong, ctypes.c_char_p] # upub, z1, bP_elem, ret
+    ice.bsgs_2nd_check.restype = ctypes.c_bool #True or False
+    #==============================================================================
+    ice.Load_data_to_memory.argtypes = [ctypes.c_char_p, ctypes.c_bool] #sorted_bin_file_h160, verbose
+    #==============================================================================
+    ice.check_collision.argtypes = [ctypes.c_char_p] #h160
+    ice.check_collision.restype = ctypes.c_bool #True or False
 
-ice.init_secp256_lib()
+    ice.init_secp256_lib()
+    return ice
+
+class _LazyLibrary:
+    ''' Stands in for the library until the first attribute lookup loads it and
+    rebinds ice, after which calls go straight to the ctypes functions '''
+    def __getattr__(self, name):
+        return getattr(_load_library(), name)
+
+ice = _LazyLibrary()
 #==============================================================================
 ###############################################################################
 
@@ -373,6 +389,36 @@ def pubkey_to_h160(addr_type, iscompressed, pubkey_bytes):
     res = _pubkey_to_h160(addr_type, iscompressed, pubkey_bytes)
     return bytes(bytearray(res))
 #==============================================================================
+def _pubkeys_to_h160(addr_type, iscompressed, pubkeys_bytes, num):
+    # type = 0 [p2pkh],  1 [p2sh],  2 [bech32]
+    res = bytearray(20 * num)
+    h160 = bytes(20)
+    for i in range(num):
+        ice.pubkey_to_h160(addr_type, iscompressed, pubkeys_bytes[65*i:65*i+65], h160)
+        res[20*i:20*i+20] = h160
+    return res
+def pubkeys_to_h160(addr_type, iscompressed, pubkeys_bytes):
+    ''' Contiguous 65*num bytes of upub input. Output is 20*num bytes of h160 in the same order'''
+    num = len(pubkeys_bytes) // 65
+    res = _pubkeys_to_h160(addr_type, iscompressed, pubkeys_bytes, num)
+    return bytes(res)
+#==============================================================================
+def privatekeys_to_h160(addr_type, iscompressed, pvks_bytes):
+    ''' Contiguous 32*num bytes of big endian privatekeys input. All keys go through one scalar_multiplications call.
+    Output is 20*num bytes of h160 in the same order. No Zero Point handling'''
+    num = len(pvks_bytes) // 32
+    pubkeys = (b'\x00') * (65 * num)
+    ice.scalar_multiplications(pvks_bytes, num, pubkeys)
+    res = _pubkeys_to_h160(addr_type, iscompressed, pubkeys, num)
+    return bytes(res)
+#==============================================================================
+def find_h160(h160_bytes, target_h160):
+    ''' Index of target_h160 inside a contiguous 20*num bytes h160 buffer. -1 if not present'''
+    pos = h160_bytes.find(target_h160)
+    while pos != -1 and pos % 20:
+        pos = h160_bytes.find(target_h160, pos + 1)
+    return pos if pos == -1 else pos // 20
+#==============================================================================
 def _pub_endo1(pubkey_bytes):
     res = (b'\x00') * 65
     ice.pub_endo1(pubkey_bytes, res)
@@ -651,10 +697,11 @@ def privatekey_group_to_ETH_address_bytes(pvk_int, m):
     return bytes(bytearray(res))
 #==============================================================================
 def bloom_check_add_mcpu(bigbuff, num_items, sz, mcpu, check_add, bloom_bits, bloom_hashes, bloom_filter):
-    found_array = (b'\x00') * num_items
+    # A fresh buffer, b'\x00' * 1 is the shared b'\x00' constant and must not be written to
+    found_array = ctypes.create_string_buffer(num_items)
 #    sz = 32; check_add = 0 for check and 1 for add
     ice.bloom_check_add_mcpu(bigbuff, num_items, found_array, sz, mcpu, check_add, bloom_bits, bloom_hashes, bloom_filter)
-    return found_array
+    return found_array.raw
 #==============================================================================
 def to_cpub(pub_hex):
     P = pub_hex
@@ -708,6 +755,37 @@ def check_in_bloom(this_line, _bits, _hashes, _bf):
     if ice.bloom_check_add(tt, len(tt), 0, _bits, _hashes, _bf) > 0: return True
     else: return False
 #==============================================================================
+def check_add_in_bloom(this_line, _bits, _hashes, _bf):
+    ''' Add this_line to the bloom. Return True if it was already present before the add'''
+    if type(this_line) != bytes: tt = str(this_line).encode("utf-8")
+    else: tt = this_line
+    if ice.bloom_check_add(tt, len(tt), 1, _bits, _hashes, _bf) > 0: return True
+    else: return False
+#==============================================================================
+def bloom_batch_add(items, _bits, _hashes, _bf, sz = 32):
+    ''' Add every 32 byte slot of items (bytes, bytearray or NumPy array) to the bloom in one call.
+    Only the first sz bytes of each slot are hashed, sz is at most 32. Same filter as one bloom_check_add per item '''
+    if sz > 32: raise ValueError('bloom_batch_add hashes at most 32 bytes per slot, use bloom_batch_check_add')
+    num = memoryview(items).nbytes // 32
+    ice.bloom_batch_add(num, _readable(items, 32 * num), sz, 1, _bits, _hashes, _bf)
+#==============================================================================
+def bloom_batch_check_add(items, sz, _bits, _hashes, _bf, check_add = 0, mcpu = 1):
+    ''' Check (check_add = 0) or add (1) all contiguous sz byte items in one bloom_check_add_mcpu call.
+    Output is num bytes, 1 where the item was already in the bloom. Items are added in order on one thread,
+    so a repeat inside items is reported as found too '''
+    num = memoryview(items).nbytes // sz
+    found_array = ctypes.create_string_buffer(num)
+    ice.bloom_check_add_mcpu(_readable(items, sz * num), num, found_array, sz, mcpu, check_add, _bits, _hashes, _bf)
+    return found_array.raw
+#==============================================================================
+def Fill_in_bloom_batch(items, sz, _fp = 0.000001, mcpu = 1):
+    ''' Fill_in_bloom for a buffer of contiguous sz byte items, added in one call. Same 5 outputs '''
+    num = memoryview(items).nbytes // sz
+    _bits, _hashes = bloom_para(num, _fp)
+    _bf = (b'\x00') * (_bits//8)
+    bloom_batch_check_add(items, sz, _bits, _hashes, _bf, 1, mcpu)
+    return _bits, _hashes, _bf, _fp, num
+#==============================================================================
 def create_bsgs_bloom_mcpu(mcpu, total_entries, _fp = 0.0000001):
     if total_entries%(mcpu*1000) != 0:
         total_entries = mcpu*1000*(total_entries//(mcpu*1000))
@@ -767,3 +845,64 @@ def check_collision(h160):
     
     found = ice.check_collision(h160)
     return found
+#==============================================================================
+# Buffer reusing variants of the hot functions. Output goes straight into a
+# caller owned writable buffer (bytearray, memoryview, NumPy array or c_buffer)
+# at offset, nothing is allocated or copied. Private keys are raw 32 byte big endian.
+#==============================================================================
+def c_buffer(buf):
+    ''' ctypes char array sharing the memory of a writable buffer. Wrapping costs about a
+    microsecond, so loops making many single calls should wrap their buffers once with this '''
+    return (ctypes.c_char * memoryview(buf).nbytes).from_buffer(buf)
+
+def _writable(buf, size, offset = 0):
+    ''' ctypes char array over size bytes of a writable buffer, starting at offset '''
+    if isinstance(buf, ctypes.Array):
+        return (ctypes.c_char * size).from_address(ctypes.addressof(buf) + offset) if offset else buf
+    return (ctypes.c_char * size).from_buffer(buf, offset)
+
+def _readable(buf, size):
+    ''' Input buffer as a ctypes argument. bytes pass as they are, other buffers without a copy when writable '''
+    if type(buf) == bytes or isinstance(buf, ctypes.Array): return buf
+    try: return (ctypes.c_char * size).from_buffer(buf)
+    except TypeError: return (ctypes.c_char * size).from_buffer_copy(buf)
+
+def _pvk_hex(pvk_bytes):
+    ''' Raw 32 byte private key as the hex string the library parses '''
+    return bytes(pvk_bytes).hex().encode('utf8')
+#==============================================================================
+def scalar_multiplication_into(pvk_bytes, out, offset = 0):
+    ''' 65 bytes uncompressed pubkey of the 32 byte private key written into out[offset:offset+65] '''
+    ice.scalar_multiplication(_pvk_hex(pvk_bytes), _writable(out, 65, offset))
+#==============================================================================
+def scalar_multiplications_into(pvks_bytes, num, out, offset = 0):
+    ''' 65*num bytes of pubkeys of num contiguous 32 byte private keys. No Zero Point handling '''
+    ice.scalar_multiplications(_readable(pvks_bytes, 32 * num), num, _writable(out, 65 * num, offset))
+#==============================================================================
+def point_addition_into(pubkey1_bytes, pubkey2_bytes, out, offset = 0):
+    ice.point_addition(_readable(pubkey1_bytes, 65), _readable(pubkey2_bytes, 65), _writable(out, 65, offset))
+#==============================================================================
+def point_vector_addition_into(num, pubkeys1_bytes, pubkeys2_bytes, out, offset = 0):
+    ''' Adding two array of points of equal length into out. out can be one of the inputs '''
+    ice.point_vector_addition(num, _readable(pubkeys1_bytes, 65 * num), _readable(pubkeys2_bytes, 65 * num),
+                              _writable(out, 65 * num, offset))
+#==============================================================================
+def pubkey_to_h160_into(addr_type, iscompressed, pubkey_bytes, out, offset = 0):
+    ice.pubkey_to_h160(addr_type, iscompressed, _readable(pubkey_bytes, 65), _writable(out, 20, offset))
+#==============================================================================
+def pubkeys_to_h160_into(addr_type, iscompressed, pubkeys_bytes, num, out, offset = 0):
+    ''' 20*num bytes of h160 of num contiguous 65 byte pubkeys, in the same order '''
+    pubkeys = _readable(pubkeys_bytes, 65 * num)
+    src = ctypes.cast(pubkeys, ctypes.c_void_p).value
+    dst = ctypes.addressof(_writable(out, 20 * num, offset))
+    for i in range(num):
+        ice.pubkey_to_h160(addr_type, iscompressed, ctypes.c_char_p(src + 65 * i), ctypes.c_char_p(dst + 20 * i))
+#==============================================================================
+def privatekey_to_h160_into(addr_type, iscompressed, pvk_bytes, out, offset = 0):
+    # type = 0 [p2pkh],  1 [p2sh],  2 [bech32]
+    ice.privatekey_to_h160(addr_type, iscompressed, _pvk_hex(pvk_bytes), _writable(out, 20, offset))
+#==============================================================================
+def privatekey_loop_h160_sse_into(num, addr_type, iscompressed, pvk_bytes, out, offset = 0):
+    ''' 20*num bytes of h160 of num sequential private keys starting at the 32 byte pvk '''
+    if num <= 0: num = 1
+    ice.privatekey_loop_h160_sse(num, addr_type, iscompressed, _pvk_hex(pvk_bytes), _writable(out, 20 * num, offset))
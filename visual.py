@@ -1,19 +1,43 @@
+import argparse
+import contextlib
+import csv
+import json
+import math
+import mmap
+import multiprocessing
+import queue
 import random
+import sys
+import tempfile
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pygame
 import secp256k1 as ice
 import os
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
-
 # Constants
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 600
 BALL_RADIUS = 20  # Increased for better image visibility
 INITIAL_BALL_COUNT = 72
+PUZZLE_BITS = INITIAL_BALL_COUNT + 1  # 1 prefix + one bit per ball
 TARGET_ADDRESS = '12VVRNPi4SJqUTsp6FmqDqY5sGosDtysn4'
 MUSIC_VOLUME = 0.3  # 30% volume
+PHYSICS_HZ = 60  # Physics ticks per second in the windowed game
+FPS = 60  # Rendered frames per second cap
+GRID_MIN_BALLS = 128  # Ball count above which collisions use the grid broad phase
+SMALL_TARGET_SET = 16  # Target count up to which hashes are scanned directly
+ROTATION_STEP = 3  # Degrees between the cached rotations of the ball image
+SHADOW_OFFSET = 3
+SEARCH_SLICE = 256  # Candidates hashed between pauses of a budgeted search
+WORLD_REPORT_TICKS = 10  # Ticks between the search counts a world process reports
+BSGS_BABY_STEPS = 4000000  # Baby steps in the BSGS bloom, keys covered per giant step
+BSGS_GIANT_STEPS = 4096  # Giant steps swept from every frame
+BSGS_FALSE_POSITIVE = 0.0000001
+KANGAROO_HERD = 2048  # Kangaroos, half tame and half wild
+KANGAROO_STEPS = 16  # Jumps of the whole herd per frame
 
 # Colors
 RED = (255, 255, 255)
@@ -24,11 +48,28 @@ BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 SHADOW_COLOR = (50, 50, 50, 100)
 
-# Initialize screen and font
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Interactive Ball Game - Bitcoin Address Search")
-font = pygame.font.Font(None, 36)
-small_font = pygame.font.Font(None, 24)
+# (addr_type, iscompressed) of the hash160 behind each address format
+ADDRESS_FORMATS = {
+    'compressed': (0, True),
+    'bech32': (0, True),  # bc1q addresses hash the compressed key, same as compressed 1...
+    'uncompressed': (0, False),
+    'p2sh': (1, True),  # 3... P2SH-P2WPKH, compressed keys only
+}
+
+# Screen and fonts, created by init_display for the windowed game
+screen = None
+font = None
+small_font = None
+
+
+def init_display():
+    """Initialize Pygame, open the game window and load fonts"""
+    global screen, font, small_font
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Interactive Ball Game - Bitcoin Address Search")
+    font = pygame.font.Font(None, 36)
+    small_font = pygame.font.Font(None, 24)
 
 
 class ImageLoader:
@@ -38,6 +79,9 @@ class ImageLoader:
         self.background = None
         self.ball_image = None
         self.default_ball_color = RED
+        # Sprite cache: shadows by radius, ball image rotated every ROTATION_STEP degrees
+        self.shadows = {}
+        self.rotations = []
         
     def load_background(self, filepath):
         """Load and scale background image"""
@@ -95,6 +139,28 @@ class ImageLoader:
                          BALL_RADIUS//3)
         self.ball_image = surface
         print("Created default ball image")
+    
+    def build_sprite_cache(self):
+        """Pre-rotate the ball image, blitted centred from (sprite, half width, half height)"""
+        self.rotations = []
+        if self.ball_image is None:
+            return
+        for angle in range(0, 360, ROTATION_STEP):
+            sprite = pygame.transform.rotate(self.ball_image, angle)
+            self.rotations.append((sprite, sprite.get_width() // 2, sprite.get_height() // 2))
+    
+    def rotated_ball(self, angle):
+        """Cached ball image at the nearest step to angle"""
+        return self.rotations[int(round(angle / ROTATION_STEP)) % len(self.rotations)]
+    
+    def shadow(self, radius):
+        """Shared shadow surface for a ball of this radius"""
+        surface = self.shadows.get(radius)
+        if surface is None:
+            surface = pygame.Surface((radius * 2 + 10, radius * 2 + 10), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (0, 0, 0, 50), (radius + 5, radius + 5), radius)
+            self.shadows[radius] = surface
+        return surface
 
 
 class Ball:
@@ -213,10 +279,276 @@ class Ball:
             # Fallback to colored circle if no image
             pygame.draw.circle(surface, RED, (int(self.x), int(self.y)), self.radius)
             pygame.draw.circle(surface, RED, (int(self.x), int(self.y)), self.radius, 2)
+    
+    def blit_items(self, sprites):
+        """(surface, position) pairs of the shadow and the rotated image, from the sprite cache"""
+        sprite, half_width, half_height = sprites.rotated_ball(self.rotation)
+        return [
+            (sprites.shadow(self.radius), (int(self.x - self.radius - 5 + SHADOW_OFFSET),
+                                           int(self.y - self.radius - 5 + SHADOW_OFFSET))),
+            (sprite, (int(self.x) - half_width, int(self.y) - half_height)),
+        ]
+
+
+class Renderer:
+    """Redraws only the parts of the screen that changed
+    
+    The first frame is drawn in full and flipped. After that, the background is
+    restored under the rects drawn last frame, every sprite goes out in one
+    Surface.blits call, and only the old and new rects are pushed with
+    display.update. Text surfaces are rendered once and reused.
+    """
+    
+    def __init__(self, surface, background=None):
+        self.surface = surface
+        self.background = background
+        self.full_redraw = True
+        self.previous_rects = []
+        self.texts = {}
+        self.score = None
+        self.score_surface = None
+    
+    def text(self, text, color=YELLOW):
+        """Cached render of a text that does not change"""
+        key = (text, color)
+        if key not in self.texts:
+            self.texts[key] = font.render(text, True, color)
+        return self.texts[key]
+    
+    def score_text(self, score):
+        """Score surface, rendered again only when the score changes"""
+        if score != self.score:
+            self.score = score
+            self.score_surface = font.render(f"Score: {score}", True, YELLOW)
+        return self.score_surface
+    
+    def restore(self, rects):
+        """Paint the background back over rects"""
+        if self.background:
+            self.surface.blits([(self.background, rect, rect) for rect in rects], doreturn=False)
+        else:
+            for rect in rects:
+                self.surface.fill(RED, rect)
+    
+    @staticmethod
+    def merge_rects(rects):
+        """Union each run of overlapping rects, like a ball's shadow and sprite"""
+        merged = []
+        for rect in rects:
+            if merged and merged[-1].colliderect(rect):
+                merged[-1].union_ip(rect)
+            else:
+                merged.append(rect)
+        return merged
+    
+    def draw(self, items):
+        """Draw (surface, position) pairs over a clean background and show them"""
+        if self.full_redraw:
+            self.restore([self.surface.get_rect()])
+            self.previous_rects = self.merge_rects(self.surface.blits(items))
+            pygame.display.flip()
+            self.full_redraw = False
+            return
+        
+        self.restore(self.previous_rects)
+        rects = self.merge_rects(self.surface.blits(items))
+        pygame.display.update(self.previous_rects + rects)
+        self.previous_rects = rects
+
+
+class PhysicsWorld:
+    """Struct-of-arrays physics for all balls
+    
+    Positions, velocities and rotations live in NumPy arrays and every step is
+    vectorised. Wall bounces follow Ball.update. Ball pairs use the overlap and
+    impulse formulas of Ball.check_collision, with every overlapping pair
+    resolved at once from the positions and velocities at the start of the pass.
+    """
+    
+    def __init__(self, balls, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, broad_phase=None):
+        self.width = width
+        self.height = height
+        self.x = np.array([ball.x for ball in balls], dtype=np.float64)
+        self.y = np.array([ball.y for ball in balls], dtype=np.float64)
+        self.dx = np.array([ball.dx for ball in balls], dtype=np.float64)
+        self.dy = np.array([ball.dy for ball in balls], dtype=np.float64)
+        self.radius = np.array([ball.radius for ball in balls], dtype=np.float64)
+        self.gravity = np.array([ball.gravity for ball in balls], dtype=np.float64)
+        self.friction = np.array([ball.friction for ball in balls], dtype=np.float64)
+        self.rotation = np.array([ball.rotation for ball in balls], dtype=np.float64)
+        self.rotation_speed = np.array([ball.rotation_speed for ball in balls], dtype=np.float64)
+        # State before the last step, for drawing in between steps
+        self.save_previous()
+        # Testing every pair is quicker for small worlds, the grid wins beyond that
+        if broad_phase is None:
+            broad_phase = 'grid' if len(balls) > GRID_MIN_BALLS else 'all'
+        self.broad_phase = broad_phase
+        if broad_phase == 'all':
+            self.pair_i, self.pair_j = np.triu_indices(len(balls), 1)
+    
+    def __len__(self):
+        return len(self.x)
+    
+    def update(self):
+        """Move every ball and bounce it off the walls"""
+        self.dy += self.gravity
+        self.x += self.dx * self.friction
+        self.y += self.dy * self.friction
+        self.rotation += self.rotation_speed
+        
+        hit = (self.x - self.radius <= 0) | (self.x + self.radius >= self.width)
+        self.dx[hit] *= -1
+        self.rotation_speed[hit] *= -1
+        np.clip(self.x, self.radius, self.width - self.radius, out=self.x)
+        
+        hit = (self.y - self.radius <= 0) | (self.y + self.radius >= self.height)
+        self.dy[hit] *= -1
+        self.rotation_speed[hit] *= -1
+        np.clip(self.y, self.radius, self.height - self.radius, out=self.y)
+    
+    def candidate_pairs(self):
+        """Index arrays (i, j) of the ball pairs that may touch"""
+        if self.broad_phase == 'all':
+            return self.pair_i, self.pair_j
+        return self.grid_pairs()
+    
+    def grid_pairs(self):
+        """Pairs of balls in the same or adjacent cells of a uniform grid
+        
+        Cells are one ball diameter wide, so touching balls are never more than
+        one cell apart. Each cell pair is visited once through a half neighbourhood.
+        """
+        count = len(self)
+        cell = 2 * self.radius.max()
+        columns = int(self.width // cell) + 1
+        rows = int(self.height // cell) + 1
+        cx = np.clip((self.x // cell).astype(np.int64), 0, columns - 1)
+        cy = np.clip((self.y // cell).astype(np.int64), 0, rows - 1)
+        
+        # Cell table: one row per cell, one slot per ball in it, -1 for empty slots
+        keys = cy * columns + cx
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        slot = np.arange(count) - np.searchsorted(sorted_keys, sorted_keys)
+        slots = int(slot.max()) + 1 if count else 1
+        table = np.full((rows * columns, slots), -1, dtype=np.int64)
+        table[sorted_keys, slot] = order
+        
+        pair_i = []
+        pair_j = []
+        for ox, oy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+            nx = cx + ox
+            ny = cy + oy
+            source = np.nonzero((nx >= 0) & (nx < columns) & (ny < rows))[0]
+            others = table[ny[source] * columns + nx[source]].ravel()
+            source = np.repeat(source, slots)
+            keep = others >= 0
+            if ox == 0 and oy == 0:
+                keep &= others > source
+            pair_i.append(source[keep])
+            pair_j.append(others[keep])
+        return np.concatenate(pair_i), np.concatenate(pair_j)
+    
+    def collide(self):
+        """Separate overlapping balls and exchange their impulse"""
+        i, j = self.candidate_pairs()
+        dx = self.x[i] - self.x[j]
+        dy = self.y[i] - self.y[j]
+        distance = np.sqrt(dx * dx + dy * dy)
+        reach = self.radius[i] + self.radius[j]
+        touching = distance < reach
+        if not touching.any():
+            return
+        i, j = i[touching], j[touching]
+        dx, dy, distance, reach = dx[touching], dy[touching], distance[touching], reach[touching]
+        
+        # Calculate overlap
+        overlap = 0.5 * (reach - distance + 1)
+        distance = np.maximum(distance, 1)  # Prevent division by zero
+        
+        # Normalize collision vector
+        nx = dx / distance
+        ny = dy / distance
+        
+        # Impulse from the relative velocity along the normal
+        impulse = (self.dx[i] - self.dx[j]) * nx + (self.dy[i] - self.dy[j]) * ny
+        
+        # Separate balls and apply impulse, summed over every contact of a ball
+        count = len(self)
+        self.x += np.bincount(i, overlap * nx, count) - np.bincount(j, overlap * nx, count)
+        self.y += np.bincount(i, overlap * ny, count) - np.bincount(j, overlap * ny, count)
+        self.dx += np.bincount(j, impulse * nx, count) - np.bincount(i, impulse * nx, count)
+        self.dy += np.bincount(j, impulse * ny, count) - np.bincount(i, impulse * ny, count)
+    
+    def save_previous(self):
+        """Remember the current positions and rotations as the previous step"""
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+        self.previous_rotation = self.rotation.copy()
+    
+    def step(self):
+        """Advance the world by one frame"""
+        self.save_previous()
+        self.update()
+        self.collide()
+    
+    def speed_bits(self):
+        """Binary string of Ball.get_speed_binary for all balls"""
+        bits = np.sqrt(self.x * self.x + self.y * self.y).astype(np.int64) & 1
+        return (bits + ord('0')).astype(np.uint8).tobytes().decode('ascii')
+    
+    def apply_click(self, mouse_x, mouse_y, power_multiplier=50):
+        """Ball.handle_click for all balls, returns how many were hit"""
+        dx = mouse_x - self.x
+        dy = mouse_y - self.y
+        distance = np.sqrt(dx * dx + dy * dy)
+        hit = distance <= self.radius
+        # Apply force away from click point
+        push = hit & (distance > 0)
+        self.dx[push] = -(dx[push] / distance[push]) * power_multiplier
+        self.dy[push] = -(dy[push] / distance[push]) * power_multiplier
+        return int(hit.sum())
+    
+    def sync_balls(self, balls, alpha=1.0):
+        """Copy positions and rotations back into the Ball objects for drawing
+        
+        alpha blends from the previous step (0) to the current one (1).
+        """
+        x, y, rotation = self.x, self.y, self.rotation
+        if alpha < 1.0:
+            x = self.previous_x + (x - self.previous_x) * alpha
+            y = self.previous_y + (y - self.previous_y) * alpha
+            rotation = self.previous_rotation + (rotation - self.previous_rotation) * alpha
+        for ball, x, y, rotation in zip(balls, x.tolist(), y.tolist(), rotation.tolist()):
+            ball.x = x
+            ball.y = y
+            ball.rotation = rotation
+
+
+# Bit reversal of every byte value
+REVERSED_BYTES = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
 
 
 class HexManipulator:
-    """Handles hex string manipulations"""
+    """Handles hex string manipulations
+    
+    The string methods work on any length. The integer methods do the same
+    transformations on bits wide values with shifts, masks and a byte lookup
+    table, without building strings. Hex digit shifts work on a NumPy array of
+    the nibbles instead of adding 0x11..1 to each integer with SWAR masks: one
+    broadcast add gives all 16 shifts of every value, where the integer form
+    takes a Python call per value and shift.
+    """
+    
+    def __init__(self, bits=INITIAL_BALL_COUNT):
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.prefix = 1 << bits
+        self.byte_count = (bits + 7) // 8
+        self.reverse_shift = 8 * self.byte_count - bits
+        self.hex_width = bits // 4
+        # 0x11..1, what one hex shift adds when no digit wraps
+        self.ones = int('1' * (bits // 4), 16)
     
     @staticmethod
     def shift_hex_digits(hex_string):
@@ -234,31 +566,1194 @@ class HexManipulator:
     def invert_binary(binary_string):
         """Invert binary string (0->1, 1->0)"""
         return ''.join('1' if c == '0' else '0' for c in binary_string)
+    
+    def rotate_left_bits(self, value, n=1):
+        """Rotate value left by n bit positions"""
+        n %= self.bits
+        return ((value << n) | (value >> (self.bits - n))) & self.mask
+    
+    def invert_bits(self, value):
+        """Invert every bit of value"""
+        return value ^ self.mask
+    
+    def reverse_bits(self, value):
+        """Reverse the bit order of value through the byte lookup table"""
+        reversed_bytes = value.to_bytes(self.byte_count, 'little').translate(REVERSED_BYTES)
+        return int.from_bytes(reversed_bytes, 'big') >> self.reverse_shift
+    
+    def nibbles(self, values):
+        """(len(values), bits // 4) array of the hex digits of values, most significant first"""
+        data = b''.join(value.to_bytes(self.byte_count, 'big') for value in values)
+        octets = np.frombuffer(data, dtype=np.uint8).reshape(-1, self.byte_count)
+        digits = np.empty((len(octets), 2 * self.byte_count), dtype=np.uint8)
+        digits[:, 0::2] = octets >> 4
+        digits[:, 1::2] = octets & 15
+        return digits[:, 2 * self.byte_count - self.hex_width:]
+    
+    def hex_shift_keys(self, digits, shifts=16):
+        """32 byte big endian private keys of every hex shift of every row of digits
+        
+        Keys are row major: all shifts of the first row, then the next row.
+        """
+        rows, width = digits.shape
+        key_nibbles = np.zeros((rows, shifts, 64), dtype=np.uint8)
+        shifted = digits[:, None, :] + np.arange(shifts, dtype=np.uint8)[:, None]
+        key_nibbles[:, :, 64 - width:] = shifted & 15
+        key_nibbles[:, :, 63 - width] = 1  # '1' prefix
+        return ((key_nibbles[:, :, 0::2] << 4) | key_nibbles[:, :, 1::2]).tobytes()
+
+
+def run_steps(steps):
+    """Run a step generator to the end and return its result"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+class TransformEngine:
+    """Derives the public keys of every search transformation from point operations
+    
+    Only the frame value and its bit reversal need a scalar multiplication.
+    Inversion, rotation and hex shifts are linear in the key, so their points
+    follow from additions of precomputed multiples of G.
+    """
+    
+    def __init__(self, bits=INITIAL_BALL_COUNT, max_bit_flips=3):
+        self.bits = bits
+        self.max_bit_flips = max_bit_flips
+        self.hex_manipulator = HexManipulator(bits)
+        
+        # Precomputed multiples of G
+        self.mask_point = ice.scalar_multiplication(self.hex_manipulator.mask)
+        self.prefix_point = ice.scalar_multiplication(self.hex_manipulator.prefix)
+        self.ones_point = ice.scalar_multiplication(self.hex_manipulator.ones)
+        # A nibble wrapping from f to 0 loses 16 * 16^i, one row per hex digit
+        # with the most significant first
+        self.wrap_points = self.point_array([ice.point_negation(ice.scalar_multiplication(16 ** (i + 1)))
+                                             for i in reversed(range(bits // 4))])
+        # 2^i G, to carry the frame points over when only a few bits flip
+        self.bit_points = [ice.scalar_multiplication(1 << i) for i in range(bits)]
+        self.frame_points = {}
+    
+    @staticmethod
+    def add_points(points, addends):
+        """Pairwise addition of two (n, 65) point arrays in one batched call"""
+        result = np.empty_like(points)
+        ice.point_vector_addition_into(len(points), points, addends, result)
+        return result
+    
+    @staticmethod
+    def point_array(points):
+        """(n, 65) array of a list of 65 byte points"""
+        return np.frombuffer(bytearray(b''.join(points)), dtype=np.uint8).reshape(-1, 65)
+    
+    def frame_point(self, slot, value):
+        """Public point of value, updated from the last point kept in slot
+        
+        A handful of additions of 2^i G is cheaper than a scalar multiplication,
+        so the cached point is only reused while at most max_bit_flips bits differ.
+        """
+        previous = self.frame_points.get(slot)
+        if previous is not None and bin(previous[0] ^ value).count('1') <= self.max_bit_flips:
+            previous_value, point = previous
+            changed = previous_value ^ value
+            while changed:
+                low = changed & -changed
+                bit_point = self.bit_points[low.bit_length() - 1]
+                if value & low:
+                    point = ice.point_addition(point, bit_point)
+                else:
+                    point = ice.point_subtraction(point, bit_point)
+                changed ^= low
+        else:
+            point = ice.scalar_multiplication(value)
+        self.frame_points[slot] = (value, point)
+        return point
+    
+    def rotations(self, value, point):
+        """Yield (value, point) for every left rotation of value"""
+        yield value, point
+        for _ in range(self.bits - 1):
+            carry = value >> (self.bits - 1)
+            value = self.hex_manipulator.rotate_left_bits(value)
+            # rotl(k) = 2k - carry * (2^bits - 1)
+            point = ice.point_doubling(point)
+            if carry:
+                point = ice.point_subtraction(point, self.mask_point)
+            yield value, point
+    
+    def transform(self, binary_string):
+        """Return (key_buffer, pubkeys) for every transformation of binary_string
+        
+        Keys follow the invert/reverse/shift/hex_shift order of the search loop.
+        key_buffer holds them as 32 byte big endian private keys back to back,
+        pubkeys holds the matching 65 byte points.
+        """
+        return run_steps(self.transform_steps(binary_string))
+    
+    def transform_steps(self, binary_string):
+        """Generator form of transform, pausing between stages of about a millisecond"""
+        hex_manipulator = self.hex_manipulator
+        value = int(binary_string, 2)
+        reversed_value = hex_manipulator.reverse_bits(value)
+        orientations = [(value, self.frame_point(0, value)),
+                        (reversed_value, self.frame_point(1, reversed_value))]
+        # invert(k) = (2^bits - 1) - k
+        orientations += [(hex_manipulator.invert_bits(v), ice.point_subtraction(self.mask_point, p))
+                         for v, p in orientations]
+        
+        values = []
+        points = []
+        for orientation_value, orientation_point in orientations:
+            for rotated_value, rotated_point in self.rotations(orientation_value, orientation_point):
+                values.append(rotated_value)
+                points.append(rotated_point)
+            yield
+        
+        # Add the '1' prefix. The point at infinity breaks batched addition,
+        # so a zero value takes the prefix point as it is
+        count = len(values)
+        current = self.point_array([self.prefix_point] * count)
+        rows = [i for i, v in enumerate(values) if v]
+        if rows:
+            current[rows] = self.add_points(self.point_array([points[i] for i in rows]), current[rows])
+        yield
+        
+        ones = self.point_array([self.ones_point] * count)
+        digits = hex_manipulator.nibbles(values)
+        point_columns = [current]
+        for shift in range(1, 16):
+            # shift(k) = k + 0x11..1 - sum(16 * 16^i for every f nibble i)
+            current = self.add_points(current, ones)
+            # The nibbles wrapping from f to 0 now are the ones that started at 16 - shift
+            rows, columns = np.nonzero(digits == 16 - shift)
+            # A row with several wrapping nibbles takes one per round
+            rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+            for round_index in range(int(rank.max()) + 1 if len(rows) else 0):
+                picked = rank == round_index
+                picked_rows = rows[picked]
+                current[picked_rows] = self.add_points(current[picked_rows],
+                                                       self.wrap_points[columns[picked]])
+            point_columns.append(current)
+            yield
+        
+        key_buffer = hex_manipulator.hex_shift_keys(digits)
+        yield
+        # Interleave the columns into row major candidate order
+        pubkeys = np.stack(point_columns, axis=1).tobytes()
+        return key_buffer, pubkeys
+
+
+class TestedKeyCache:
+    """Bounded memory of recently tested private keys
+    
+    The exact mode is an LRU of key bytes. The bloom mode is a fixed size bloom
+    filter, checked and filled a whole frame per call. It uses far less memory
+    but cannot forget single keys, so it starts over before capacity keys went
+    in, and a false positive skips a key that was never tested.
+    """
+    
+    def __init__(self, capacity, bloom=False, false_positive=0.000001, key_size=32):
+        self.capacity = capacity
+        self.bloom = bloom
+        # Only the trailing key_size bytes of each 32 byte key can differ
+        self.key_size = key_size
+        self.count = 0
+        if bloom:
+            self.bloom_bits, self.bloom_hashes = ice.bloom_para(capacity, false_positive)
+        self.clear()
+    
+    def clear(self):
+        """Forget every key"""
+        self.count = 0
+        if self.bloom:
+            self.bloom_filter = (b'\x00') * (self.bloom_bits // 8)
+        else:
+            self.keys = OrderedDict()
+    
+    def filter(self, key_buffer):
+        """Indices of the keys in key_buffer not tested before, remembering all of them"""
+        if self.bloom:
+            return self.filter_bloom(key_buffer)
+        fresh = []
+        for index, end in enumerate(range(32, len(key_buffer) + 1, 32)):
+            key = key_buffer[end - self.key_size:end]
+            if key in self.keys:
+                self.keys.move_to_end(key)
+            else:
+                self.keys[key] = None
+                fresh.append(index)
+        
+        while len(self.keys) > self.capacity:
+            self.keys.popitem(last=False)
+        self.count = len(self.keys)
+        return fresh
+    
+    def filter_bloom(self, key_buffer):
+        """filter in bloom mode, up to capacity keys checked and added per library call"""
+        keys = np.frombuffer(key_buffer, dtype=np.uint8).reshape(-1, 32)[:, 32 - self.key_size:]
+        fresh = []
+        for start in range(0, len(keys), self.capacity):
+            chunk = np.ascontiguousarray(keys[start:start + self.capacity])
+            if self.count + len(chunk) > self.capacity:
+                self.clear()
+            seen = ice.bloom_batch_check_add(chunk, self.key_size, self.bloom_bits, self.bloom_hashes,
+                                             self.bloom_filter, 1)
+            new = np.flatnonzero(np.frombuffer(seen, dtype=np.uint8) == 0)
+            self.count += len(new)
+            fresh.extend((new + start).tolist())
+        return fresh
+
+
+def address_to_h160(address):
+    """20 byte hash160 of a P2PKH, P2SH or bech32 P2WPKH address, or of a 40 digit hex string"""
+    address = address.strip()
+    if len(address) == 40 and all(c in '0123456789abcdefABCDEF' for c in address):
+        return bytes.fromhex(address)
+    if address.lower().startswith('bc1'):
+        h160 = ice.bech32_address_decode(address)
+        if h160 == '0' * 40:
+            raise ValueError(f"Unsupported bech32 address: {address}")
+    else:
+        h160 = ice.address_to_h160(address)
+    if len(h160) != 40:
+        raise ValueError(f"Invalid address: {address}")
+    return bytes.fromhex(h160)
+
+
+class TargetSet:
+    """Target hash160s, checked at a constant cost per candidate
+    
+    A few targets are scanned for directly in the hash buffer. Larger sets go
+    through two tiers: a bloom filter (Fill_in_bloom_batch/bloom_batch_check_add)
+    drops nearly every candidate, and the rare bloom hits are confirmed by a
+    binary search over the sorted hash160 table (prepare_bin_file/
+    Load_data_to_memory/check_collision). The library holds one table per process, so only one
+    large TargetSet can be in use at a time.
+    """
+    
+    def __init__(self, h160s, label=None, table_file=None, false_positive=0.000001):
+        self.count = len(h160s)
+        self.label = label or f"{self.count} addresses"
+        self.hashes = None
+        self.bloom = None
+        if self.count <= SMALL_TARGET_SET:
+            self.hashes = list(h160s)
+            return
+        
+        self.bloom = ice.Fill_in_bloom_batch(b''.join(h160s), 20, false_positive)
+        keep_table = table_file is not None
+        if not keep_table:
+            handle, table_file = tempfile.mkstemp(suffix='.bin')
+            os.close(handle)
+        self.write_table(h160s, table_file)
+        ice.Load_data_to_memory(table_file)
+        if not keep_table:
+            os.remove(table_file)
+    
+    @staticmethod
+    def write_table(h160s, table_file):
+        """Write the sorted binary hash160 table used by check_collision"""
+        hex_file = table_file + '.txt'
+        with open(hex_file, 'w') as file:
+            file.writelines(h160.hex() + '\n' for h160 in h160s)
+        if os.path.isfile(table_file):
+            os.remove(table_file)
+        ice.prepare_bin_file(hex_file, table_file, lower=True)
+        os.remove(hex_file)
+    
+    @classmethod
+    def from_addresses(cls, addresses):
+        """Targets from a list of addresses or hash160 hex strings"""
+        addresses = list(addresses)
+        label = addresses[0] if len(addresses) == 1 else None
+        return cls([address_to_h160(address) for address in addresses], label)
+    
+    @classmethod
+    def load(cls, path, false_positive=0.000001):
+        """Targets from a file with one address or hash160 hex per line
+        
+        The bloom filter and the sorted table are cached next to the file, as
+        path.bloom and path.bin, and reused while they are newer than it.
+        """
+        table_file = path + '.bin'
+        bloom_file = path + '.bloom'
+        if all(os.path.isfile(f) and os.path.getmtime(f) >= os.path.getmtime(path)
+               for f in (table_file, bloom_file)):
+            bloom = ice.read_bloom_file(bloom_file)
+            if bloom[4] > SMALL_TARGET_SET:
+                targets = cls.__new__(cls)
+                targets.count = bloom[4]
+                targets.label = f"{targets.count} addresses"
+                targets.hashes = None
+                targets.bloom = bloom
+                ice.Load_data_to_memory(table_file)
+                return targets
+        
+        with open(path) as file:
+            addresses = [line.split()[0] for line in file
+                         if line.strip() and not line.lstrip().startswith('#')]
+        if len(addresses) <= SMALL_TARGET_SET:
+            return cls.from_addresses(addresses)
+        targets = cls([address_to_h160(address) for address in addresses],
+                      table_file=table_file, false_positive=false_positive)
+        ice.dump_bloom_file(bloom_file, *targets.bloom)
+        return targets
+    
+    def find(self, hashes, threads=1):
+        """Index of the first target in a buffer of 20 byte hashes, or -1
+        
+        The bloom pass checks the whole buffer in one bloom_batch_check_add call
+        on threads native threads.
+        """
+        if self.hashes is not None:
+            found = [ice.find_h160(hashes, h160) for h160 in self.hashes]
+            found = [index for index in found if index != -1]
+            return min(found) if found else -1
+        
+        bloom_bits, bloom_hashes, bloom_filter = self.bloom[:3]
+        count = len(hashes) // 20
+        if not count:
+            return -1
+        hits = ice.bloom_batch_check_add(hashes, 20, bloom_bits, bloom_hashes, bloom_filter, 0, threads)
+        index = hits.find(1)
+        while index != -1:
+            if ice.check_collision(hashes[20 * index:20 * index + 20]):
+                return index
+            index = hits.find(1, index + 1)
+        return -1
+
+
+class AddressSearcher:
+    """Checks every transformation of a binary string against the target hash160s"""
+    
+    def __init__(self, target_address=TARGET_ADDRESS, bits=INITIAL_BALL_COUNT,
+                 dedup_size=0, dedup_bloom=False, targets_file=None, threads=1, radius=0,
+                 formats=('compressed',)):
+        if targets_file:
+            self.targets = TargetSet.load(targets_file)
+        else:
+            self.targets = TargetSet.from_addresses([target_address])
+        # Only the native hash of each key releases the GIL, the per-key Python loop
+        # around it holds it for about half the time, so hashing threads top out
+        # near 2x however many there are. The bloom check is one native call and scales
+        self.threads = threads
+        self.hash_pool = ThreadPoolExecutor(threads) if threads > 1 else None
+        # Keys on each side of every candidate that are hashed as well
+        self.radius = radius
+        # Hash160 variants derived from every public key, formats sharing a hash160 once
+        self.formats = list(dict.fromkeys(ADDRESS_FORMATS[name] for name in formats))
+        self.transform_engine = TransformEngine(bits)
+        # Keys tested in recent frames, None hashes every candidate
+        self.tested_keys = None
+        if dedup_size:
+            self.tested_keys = TestedKeyCache(dedup_size, dedup_bloom, key_size=bits // 8 + 1)
+        self.last_binary_string = None
+        self.first_key = None
+        self.first_h160 = None
+        # Candidates generated, skipped as repeats and hashed
+        self.generated = 0
+        self.deduplicated = 0
+        self.hashed = 0
+    
+    def search(self, binary_string):
+        """Return the private key that matches a target, or None"""
+        return run_steps(self.search_steps(binary_string, slice_size=None))
+    
+    def search_steps(self, binary_string, slice_size=SEARCH_SLICE):
+        """Generator form of search, pausing between stages and between hashed slices"""
+        # A frame identical to the last one was fully tested already
+        if binary_string == self.last_binary_string:
+            self.first_h160 = None
+            return None
+        self.last_binary_string = binary_string
+        
+        # Public keys of every transformation, hashed below
+        key_buffer, pubkeys = yield from self.transform_engine.transform_steps(binary_string)
+        count = len(key_buffer) // 32
+        self.generated += count
+        self.first_key = int.from_bytes(key_buffer[:32], 'big')
+        
+        # Drop keys tested recently, or earlier in this frame
+        fresh = None
+        if self.tested_keys is not None:
+            fresh = self.tested_keys.filter(key_buffer)
+            self.deduplicated += count - len(fresh)
+            if len(fresh) < count:
+                pubkeys = np.frombuffer(pubkeys, dtype=np.uint8).reshape(-1, 65)[fresh].tobytes()
+            yield
+        
+        hashed = len(pubkeys) // 65
+        slice_size = slice_size or max(hashed, 1)
+        for start in range(0, hashed, slice_size):
+            chunk = pubkeys[65 * start:65 * (start + slice_size)]
+            self.hashed += len(chunk) // 65
+            for addr_type, compressed in self.formats:
+                hashes = self.hash_pubkeys(chunk, addr_type, compressed)
+                
+                # Kept for the per iteration log line
+                if start == 0 and (addr_type, compressed) == self.formats[0]:
+                    self.first_h160 = hashes[:20] if fresh is None or (fresh and fresh[0] == 0) else None
+                
+                index = self.targets.find(hashes, self.threads)
+                if index != -1:
+                    index += start
+                    if fresh is not None:
+                        index = fresh[index]
+                    return int.from_bytes(key_buffer[32 * index:32 * index + 32], 'big')
+            yield
+        if not hashed:
+            self.first_h160 = None
+        
+        # Neighbourhood of every hashed candidate, one sequential library loop each
+        if self.radius:
+            per_pause = max(1, slice_size // (2 * self.radius + 1))
+            for position, index in enumerate(range(count) if fresh is None else fresh, 1):
+                private_key = self.scan_neighbourhood(int.from_bytes(key_buffer[32 * index:32 * index + 32], 'big'))
+                if private_key is not None:
+                    return private_key
+                if position % per_pause == 0:
+                    yield
+        return None
+    
+    def scan_neighbourhood(self, key):
+        """Key within radius of key that matches a target, or None
+        
+        privatekey_loop_h160_sse walks the range with point additions, so only
+        its first key costs a scalar multiplication. The key itself is hashed
+        again, a single call is cheaper than one on each side.
+        """
+        start = max(1, key - self.radius)
+        span = key + self.radius + 1 - start
+        self.hashed += span
+        for addr_type, compressed in self.formats:
+            hashes = ice.privatekey_loop_h160_sse(span, addr_type, compressed, start)
+            index = self.targets.find(hashes, self.threads)
+            if index != -1:
+                return start + index
+        return None
+    
+    def hash_pubkeys(self, pubkeys, addr_type=0, compressed=True):
+        """Hash160s of a pubkey buffer, split over the hashing threads
+        
+        pubkeys_to_h160 calls the library once per key, so the threads only
+        overlap the native hashing, see the note in __init__.
+        """
+        if self.hash_pool is None:
+            return ice.pubkeys_to_h160(addr_type, compressed, pubkeys)
+        count = len(pubkeys) // 65
+        step = -(-count // self.threads)
+        parts = self.hash_pool.map(
+            lambda start: ice.pubkeys_to_h160(addr_type, compressed, pubkeys[65 * start:65 * (start + step)]),
+            range(0, count, step))
+        return b''.join(parts)
+    
+    def address_of(self, private_key):
+        """Address of private_key in the first searched format that is a target"""
+        pubkey = ice.scalar_multiplication(private_key)
+        for addr_type, compressed in self.formats:
+            h160 = ice.pubkey_to_h160(addr_type, compressed, pubkey)
+            if self.targets.find(h160) != -1:
+                return ice.hash_to_address(addr_type, compressed, h160)
+        return ice.privatekey_to_address(0, True, private_key)
+    
+    def log_line(self, iteration):
+        """Log line for the first attempt of an iteration"""
+        if self.first_h160 is None:
+            return f"{iteration} - {hex(self.first_key)[2:]} - already tested"
+        address = ice.hash_to_address(*self.formats[0], self.first_h160)
+        return f"{iteration} - {hex(self.first_key)[2:]} - {address}"
+    
+    def counts(self):
+        """(generated, deduplicated, hashed) candidates so far"""
+        return self.generated, self.deduplicated, self.hashed
+    
+    @property
+    def label(self):
+        """What the search is looking for, shown in the window"""
+        return self.targets.label
+
+
+class BsgsSearcher:
+    """Baby-step giant-step search for a target public key
+    
+    Each frame's bit string, scaled onto the puzzle range, is the start z of a
+    window. The giant steps P - (z + i*m)G are checked against a bloom of the
+    x coordinates of the baby steps jG, j = 2..m+1, so every giant step covers
+    2m keys around z + i*m. The bloom is built once, saved raw and memory
+    mapped, so runs and processes share one copy. A bloom hit is resolved, or
+    dismissed as a false positive, by bsgs_2nd_check.
+    """
+    
+    def __init__(self, pubkey, bits=PUZZLE_BITS, baby_steps=BSGS_BABY_STEPS,
+                 giant_steps=BSGS_GIANT_STEPS, bloom_file=None, threads=1):
+        self.pubkey = ice.pub2upub(pubkey)
+        self.label = f"{pubkey[:20]}... (BSGS)"
+        self.bits = bits
+        self.threads = threads
+        # The library builds the bloom in equal parts per thread
+        unit = 1000 * threads
+        self.baby_steps = max(unit, baby_steps // unit * unit)
+        self.giant_steps = giant_steps
+        self.bloom_file = bloom_file or f"bsgs_{self.baby_steps}.bloom"
+        self.bloom = self.load_bloom()
+        self.step_point = ice.scalar_multiplication(self.baby_steps)
+        # Range of a second check around one giant step, prepared on the first bloom hit
+        self.check_span = max(8000000, 2 * self.baby_steps + 2)
+        self.check_prepared = False
+        self.last_binary_string = None
+        self.first_key = None
+        # Giant steps and keys covered
+        self.generated = 0
+        self.hashed = 0
+    
+    def load_bloom(self):
+        """(bits, hashes, filter) of the baby steps, building the bloom file if needed"""
+        bloom_bits, bloom_hashes = ice.bloom_para(self.baby_steps, BSGS_FALSE_POSITIVE)
+        if not os.path.exists(self.bloom_file) or os.path.getsize(self.bloom_file) != bloom_bits // 8:
+            bloom = ice.create_bsgs_bloom_mcpu(self.threads, self.baby_steps, BSGS_FALSE_POSITIVE)
+            with open(self.bloom_file + '.tmp', 'wb') as file:
+                file.write(bloom[2])
+            os.replace(self.bloom_file + '.tmp', self.bloom_file)
+        with open(self.bloom_file, 'rb') as file:
+            # Copy on write pages, never written, so the page cache is shared
+            self.bloom_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        return bloom_bits, bloom_hashes, ice.c_buffer(self.bloom_map)
+    
+    def window_start(self, binary_string):
+        """First key of the window of a frame, the ball bits scaled onto the puzzle range
+        
+        With the default bits this is the 1 prefix followed by the ball bits.
+        """
+        low = 1 << (self.bits - 1)
+        return low + (int(binary_string, 2) * low >> len(binary_string))
+    
+    def search(self, binary_string):
+        """Return the private key of the target public key in the frame's window, or None"""
+        return run_steps(self.search_steps(binary_string, slice_size=None))
+    
+    def search_steps(self, binary_string, slice_size=SEARCH_SLICE):
+        """Generator form of search, pausing between slices of giant steps"""
+        if binary_string == self.last_binary_string:
+            return None
+        self.last_binary_string = binary_string
+        start = self.first_key = self.window_start(binary_string)
+        
+        # Start one giant step before the window, the first slice steps onto P - zG
+        current = ice.point_addition(ice.point_subtraction(self.pubkey, ice.scalar_multiplication(start)),
+                                     self.step_point)
+        slice_size = slice_size or self.giant_steps
+        bloom_bits, bloom_hashes, bloom_filter = self.bloom
+        for first in range(0, self.giant_steps, slice_size):
+            count = min(slice_size, self.giant_steps - first)
+            points = ice.point_loop_subtraction(count, current, self.step_point)
+            current = points[-65:]
+            self.generated += count
+            self.hashed += count * self.baby_steps
+            
+            xs = np.frombuffer(points, dtype=np.uint8).reshape(-1, 65)[:, 1:33].tobytes()
+            hits = ice.bloom_batch_check_add(xs, 32, bloom_bits, bloom_hashes, bloom_filter, 0, self.threads)
+            index = hits.find(1)
+            while index != -1:
+                private_key = self.second_check(start + (first + index) * self.baby_steps)
+                if private_key is not None:
+                    return private_key
+                index = hits.find(1, index + 1)
+            yield
+        return None
+    
+    def second_check(self, key):
+        """Private key within the baby steps on either side of key, None for a bloom false positive"""
+        if not self.check_prepared:
+            ice.bsgs_2nd_check_prepare(self.check_span)
+            self.check_prepared = True
+        found, private_key = ice.bsgs_2nd_check(self.pubkey, key - self.baby_steps - 1, self.check_span)
+        return int.from_bytes(private_key, 'big') if found else None
+    
+    def address_of(self, private_key):
+        """Compressed address of a found key"""
+        return ice.privatekey_to_address(0, True, private_key)
+    
+    def log_line(self, iteration):
+        """Log line for the window of an iteration"""
+        return f"{iteration} - {hex(self.first_key)[2:]} - {self.giant_steps * self.baby_steps:,} keys"
+    
+    def counts(self):
+        """(generated, deduplicated, hashed) as giant steps, 0 and keys covered"""
+        return self.generated, 0, self.hashed
+
+
+class KangarooSearcher:
+    """Pollard kangaroo search for a target public key in [2^(bits-1), 2^bits)
+    
+    Half of the herd are tame kangaroos starting at known keys in the upper
+    half of the range, the other half wild ones starting at P + wG, with the
+    offsets w drawn from the frame's bit string. The whole herd jumps at once,
+    one point_vector_addition per step, by a power of two picked from each x
+    coordinate, so walks that meet stay together. Points whose x ends in
+    dp_bits zero bits are distinguished and kept, in memory and appended to the
+    store file, with the tame key or wild offset. A tame and a wild kangaroo on
+    the same distinguished point give the key, so memory grows with the
+    distinguished points, not the range. Each frame first reads the records
+    appended since the last one, so runs sharing the store, earlier ones or the
+    other --workers and --worlds processes, hunt as one herd.
+    """
+    
+    RECORD = 49  # x prefix (16), tame or wild (1), key or offset (32)
+    
+    def __init__(self, pubkey, bits=PUZZLE_BITS, herd=KANGAROO_HERD, dp_bits=None,
+                 store_file=None, steps=KANGAROO_STEPS):
+        self.pubkey = ice.pub2upub(pubkey)
+        self.label = f"{pubkey[:20]}... (kangaroo)"
+        self.low = 1 << (bits - 1)
+        self.width = 1 << (bits - 1)
+        self.herd = herd
+        self.steps = steps
+        # Powers of two up to a mean jump of herd * sqrt(width) / 4
+        mean = max(1, herd * math.isqrt(self.width) // 4)
+        jumps = 1
+        while ((1 << jumps) - 1) // jumps < mean:
+            jumps += 1
+        self.jump_sizes = np.array([1 << j for j in range(jumps)], dtype=object)
+        self.jump_points = TransformEngine.point_array([ice.scalar_multiplication(1 << j) for j in range(jumps)])
+        # About 2 sqrt(width) / herd jumps per kangaroo, a few of them distinguished
+        if dp_bits is None:
+            dp_bits = max(0, (bits - 1) // 2 - herd.bit_length() - 2)
+        self.dp_mask = (1 << min(dp_bits, 32)) - 1
+        # Walks only meet across runs with the same jumps and distinguished points
+        self.store_file = store_file or f"kangaroo_{self.pubkey[1:9].hex()}_{bits}_{jumps}_{dp_bits}.dp"
+        # x prefix -> (kind, key or offset), filled from the store by sync_store
+        self.dps = {}
+        self.store_offset = 0
+        
+        self.kinds = np.arange(herd) % 2  # 0 tame, 1 wild
+        self.positions = np.zeros((herd, 65), dtype=np.uint8)
+        self.distances = np.zeros(herd, dtype=object)  # Key of a tame, offset of a wild kangaroo
+        self.restart = list(range(herd))
+        self.first_key = None
+        # Jumps of all kangaroos
+        self.generated = 0
+        self.hashed = 0
+    
+    def sync_store(self):
+        """Take in the store records appended since the last call, the key if one pairs up"""
+        if not os.path.exists(self.store_file):
+            return None
+        with open(self.store_file, 'rb') as file:
+            file.seek(self.store_offset)
+            data = file.read()
+        # A record another process is still writing is read on the next frame
+        data = data[:len(data) - len(data) % self.RECORD]
+        self.store_offset += len(data)
+        for start in range(0, len(data), self.RECORD):
+            x, kind = data[start:start + 16], data[start + 16]
+            value = int.from_bytes(data[start + 17:start + self.RECORD], 'big')
+            seen = self.dps.get(x)
+            if seen is None:
+                self.dps[x] = (kind, value)
+            elif seen[0] != kind:
+                private_key = self.solve(kind, value, seen)
+                if private_key is not None:
+                    return private_key
+        return None
+    
+    def start(self, slots, rng):
+        """Place the kangaroos of slots at fresh tame keys or wild offsets"""
+        half = self.width // 2
+        for slot in slots:
+            self.distances[slot] = rng.randrange(half) + (self.low + half if self.kinds[slot] == 0 else 0)
+        points = np.frombuffer(ice.scalar_multiplications([self.distances[slot] for slot in slots]),
+                               dtype=np.uint8).reshape(-1, 65).copy()
+        wild = self.kinds[slots] == 1
+        if wild.any():
+            targets = np.tile(np.frombuffer(self.pubkey, dtype=np.uint8), (int(wild.sum()), 1))
+            points[wild] = TransformEngine.add_points(np.ascontiguousarray(points[wild]), targets)
+        self.positions[slots] = points
+    
+    def search(self, binary_string):
+        """Return the private key of the target public key, or None after this frame's jumps"""
+        return run_steps(self.search_steps(binary_string, slice_size=None))
+    
+    def search_steps(self, binary_string, slice_size=SEARCH_SLICE):
+        """Generator form of search, pausing between jumps of the herd"""
+        self.first_key = int(binary_string, 2)
+        private_key = self.sync_store()
+        if private_key is not None:
+            return private_key
+        if self.restart:
+            self.start(self.restart, random.Random(self.first_key))
+            self.restart = []
+            yield
+        for _ in range(self.steps):
+            private_key = self.jump()
+            if private_key is not None:
+                return private_key
+            yield
+        return None
+    
+    def jump(self):
+        """Move every kangaroo once, returns the key when a tame and a wild walk meet"""
+        index = np.ascontiguousarray(self.positions[:, 1:5]).view('>u4').ravel() % len(self.jump_sizes)
+        self.positions = TransformEngine.add_points(self.positions, self.jump_points[index])
+        self.distances = self.distances + self.jump_sizes[index]
+        self.generated += self.herd
+        self.hashed += self.herd
+        
+        low = np.ascontiguousarray(self.positions[:, 29:33]).view('>u4').ravel()
+        records = []
+        try:
+            for slot in np.flatnonzero(low & self.dp_mask == 0):
+                private_key = self.distinguished(slot, records)
+                if private_key is not None:
+                    return private_key
+            return None
+        finally:
+            if records:
+                with open(self.store_file, 'ab') as file:
+                    file.write(b''.join(records))
+    
+    def distinguished(self, slot, records):
+        """Keep a distinguished point, adding its store record, or solve on a tame and wild pair"""
+        x = self.positions[slot, 1:17].tobytes()
+        kind, value = int(self.kinds[slot]), self.distances[slot]
+        seen = self.dps.get(x)
+        if seen is None:
+            self.dps[x] = (kind, value)
+            records.append(x + bytes([kind]) + value.to_bytes(32, 'big'))
+            return None
+        if seen[0] == kind:
+            # Walked into a path already taken, start over on the next frame
+            self.restart.append(slot)
+            return None
+        return self.solve(kind, value, seen)
+    
+    def solve(self, kind, value, seen):
+        """Key from a tame and a wild kangaroo on the same distinguished point, if they give one"""
+        tame, wild = (value, seen[1]) if kind == 0 else (seen[1], value)
+        # Same x is the same point or its negation
+        for private_key in ((tame - wild) % ice.N, (-tame - wild) % ice.N):
+            if ice.scalar_multiplication(private_key) == self.pubkey:
+                return private_key
+        return None
+    
+    def address_of(self, private_key):
+        """Compressed address of a found key"""
+        return ice.privatekey_to_address(0, True, private_key)
+    
+    def log_line(self, iteration):
+        """Log line for the jumps of an iteration"""
+        return f"{iteration} - {self.generated:,} jumps - {len(self.dps):,} distinguished points"
+    
+    def counts(self):
+        """(generated, deduplicated, hashed) as jumps, 0 and jumps"""
+        return self.generated, 0, self.hashed
+
+
+SEARCHERS = {
+    'address': AddressSearcher,
+    'bsgs': BsgsSearcher,
+    'kangaroo': KangarooSearcher,
+}
+
+
+def make_searcher(search_options):
+    """Searcher of the options' mode: address (default), bsgs or kangaroo"""
+    options = dict(search_options)
+    return SEARCHERS[options.pop('mode', 'address')](**options)
+
+
+class SearchScheduler:
+    """Runs the search a few milliseconds at a time on the main thread
+    
+    Each frame is a search_steps generator of the searcher, advanced until the
+    per tick budget is spent and resumed on the next tick. Frames submitted
+    while one is in progress wait in a single slot, where a fresher frame
+    replaces an older one that has not started.
+    """
+    
+    def __init__(self, searcher, budget_ms=8, log_prefix=''):
+        self.searcher = searcher
+        self.budget = budget_ms / 1000
+        self.log_prefix = log_prefix
+        self.current = None
+        self.pending = None
+        self.completed = 0
+        self.dropped = 0
+    
+    def submit(self, iteration, binary_string):
+        """Queue a frame, replacing a waiting one"""
+        if self.pending is not None:
+            self.dropped += 1
+        self.pending = (iteration, binary_string)
+    
+    def run(self):
+        """Work for up to the budget, returns (iteration, binary_string, private_key) matches"""
+        matches = []
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            if self.current is None:
+                if self.pending is None:
+                    break
+                iteration, binary_string = self.pending
+                self.pending = None
+                self.current = (iteration, binary_string, self.searcher.search_steps(binary_string))
+            
+            iteration, binary_string, steps = self.current
+            try:
+                next(steps)
+            except StopIteration as stop:
+                self.current = None
+                self.completed += 1
+                print(self.log_prefix + self.searcher.log_line(iteration))
+                if stop.value is not None:
+                    matches.append((iteration, binary_string, stop.value))
+        return matches
+
+
+def search_worker(tasks, results, search_options):
+    """Worker process loop: search each posted binary string and report back"""
+    searcher = make_searcher(search_options)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        iteration, binary_string = task
+        before = searcher.counts()
+        private_key = searcher.search(binary_string)
+        print(searcher.log_line(iteration))
+        counts = tuple(after - start for after, start in zip(searcher.counts(), before))
+        results.put((iteration, binary_string, private_key, counts))
+
+
+class SearchPool:
+    """Runs the address search on worker processes, off the render thread
+    
+    Frames go through a bounded queue. When the workers fall behind, only the
+    newest unsent frame is kept and older ones are dropped instead of blocking.
+    """
+    
+    def __init__(self, workers=None, search_options=None, queue_size=None):
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context('spawn')
+        self.tasks = context.Queue(queue_size or 2 * self.workers)
+        self.results = context.Queue()
+        self.pending = None
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        # Candidates generated, skipped as repeats and hashed by all workers
+        self.generated = 0
+        self.deduplicated = 0
+        self.hashed = 0
+        self.processes = [
+            context.Process(target=search_worker, args=(self.tasks, self.results, search_options or {}),
+                            daemon=True)
+            for _ in range(self.workers)
+        ]
+        for process in self.processes:
+            process.start()
+    
+    def flush(self):
+        """Move the coalesced frame to the queue if there is room"""
+        if self.pending is None:
+            return
+        try:
+            self.tasks.put_nowait(self.pending)
+            self.pending = None
+            self.submitted += 1
+        except queue.Full:
+            pass
+    
+    def submit(self, iteration, binary_string):
+        """Post a frame without blocking, replacing an older frame still waiting"""
+        self.flush()
+        if self.pending is not None:
+            self.dropped += 1
+        self.pending = (iteration, binary_string)
+        self.flush()
+    
+    def poll(self):
+        """Return the (iteration, binary_string, private_key) matches reported so far"""
+        self.flush()
+        matches = []
+        while True:
+            try:
+                iteration, binary_string, private_key, counts = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.completed += 1
+            self.generated += counts[0]
+            self.deduplicated += counts[1]
+            self.hashed += counts[2]
+            if private_key is not None:
+                matches.append((iteration, binary_string, private_key))
+        return matches
+    
+    def close(self, wait=True):
+        """Stop the workers, finishing queued frames first when wait is set"""
+        matches = []
+        if wait:
+            if self.pending is not None:
+                self.tasks.put(self.pending)
+                self.pending = None
+                self.submitted += 1
+            for _ in self.processes:
+                self.tasks.put(None)
+            # Drain while waiting so workers never block on a full pipe
+            while any(process.is_alive() for process in self.processes):
+                matches += self.poll()
+                for process in self.processes:
+                    process.join(0.05)
+            matches += self.poll()
+        else:
+            for process in self.processes:
+                process.terminate()
+        for process in self.processes:
+            process.join()
+        return matches
+    
+    def counts(self):
+        """(generated, deduplicated, hashed) candidates reported so far"""
+        return self.generated, self.deduplicated, self.hashed
+
+
+def world_velocity_range(world_index):
+    """Starting velocity range of a world, one expansion step wider per world"""
+    return [-1 - world_index, 1 + world_index]
+
+
+def world_worker(world_index, seed, iterations, search_options, results, stop):
+    """World process loop: one headless game until a match, its iteration limit or stop"""
+    game = BallGame(headless=True, seed=seed, search_options=search_options,
+                    velocity_range=world_velocity_range(world_index),
+                    world_index=world_index, results=results)
+    while not game.found and not stop.is_set() and (iterations is None or game.iteration < iterations):
+        game.tick()
+        if game.iteration % WORLD_REPORT_TICKS == 0:
+            results.put(('counts', world_index, game.searcher.counts()))
+    results.put(('counts', world_index, game.searcher.counts()))
+
+
+class WorldPool:
+    """Independent headless games on their own processes
+    
+    World i is seeded with seed + i and starts with its velocity range i steps
+    wider than the first world, so no two worlds search the same frames. Every
+    world reports its matches and search counts through one shared queue.
+    """
+    
+    def __init__(self, worlds, seed=None, search_options=None, iterations=None, first=1):
+        context = multiprocessing.get_context('spawn')
+        self.results = context.Queue()
+        self.stop = context.Event()
+        # Latest (generated, deduplicated, hashed) totals of each world
+        self.world_counts = {}
+        self.processes = [
+            context.Process(target=world_worker,
+                            args=(index, None if seed is None else seed + index, iterations,
+                                  search_options or {}, self.results, self.stop),
+                            daemon=True)
+            for index in range(first, first + worlds)
+        ]
+        for process in self.processes:
+            process.start()
+    
+    def poll(self):
+        """Return the (world_index, binary_string, private_key) matches reported so far"""
+        matches = []
+        while True:
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'counts':
+                self.world_counts[message[1]] = message[2]
+            else:
+                matches.append(message[1:])
+        return matches
+    
+    def close(self, wait=True):
+        """Stop the worlds, or let them run to their iteration limit when wait is set"""
+        if not wait:
+            self.stop.set()
+        matches = []
+        # Drain while waiting so worlds never block on a full pipe
+        while any(process.is_alive() for process in self.processes):
+            matches += self.poll()
+            if matches:
+                self.stop.set()
+            for process in self.processes:
+                process.join(0.05)
+        matches += self.poll()
+        return matches
+    
+    def counts(self):
+        """(generated, deduplicated, hashed) candidates of all worlds so far"""
+        return tuple(sum(counts[i] for counts in self.world_counts.values()) for i in range(3))
+
+
+class Stats:
+    """Stage timers, search counters and rolling throughput
+    
+    Every stage keeps its last window durations for the percentiles, and keys/s
+    is measured over the last window counter samples. With a path, a snapshot
+    is written every interval seconds: a CSV row for a .csv file, a JSON line
+    otherwise. CSV columns are fixed, every stage of STAGES whether it ran or
+    not, and rows appended to an existing file follow its header.
+    """
+    
+    PERCENTILES = (50, 95, 99)
+    STAGES = ('events', 'physics', 'search', 'draw', 'frame')
+    
+    def __init__(self, window=300, path=None, interval=10):
+        self.window = window
+        self.path = path
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_write = self.started
+        self.stages = {}
+        self.counters = (0, 0, 0)
+        self.samples = deque([(self.started, 0)], maxlen=window)
+    
+    @contextlib.contextmanager
+    def timer(self, stage):
+        """Time the body of a with block as stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+    
+    def record(self, stage, seconds):
+        """Add one duration of stage"""
+        if stage not in self.stages:
+            self.stages[stage] = deque(maxlen=self.window)
+        self.stages[stage].append(seconds)
+    
+    def count(self, counts):
+        """Update the (generated, deduplicated, hashed) totals"""
+        self.counters = tuple(counts)
+        self.samples.append((time.perf_counter(), self.counters[2]))
+    
+    def keys_per_second(self):
+        """Hashed candidates per second over the rolling window"""
+        (start, start_hashed), (end, end_hashed) = self.samples[0], self.samples[-1]
+        return (end_hashed - start_hashed) / (end - start) if end > start else 0.0
+    
+    def snapshot(self):
+        """Flat dict of the counters, keys/s and stage percentiles in milliseconds"""
+        generated, deduplicated, hashed = self.counters
+        row = {
+            'elapsed': round(time.perf_counter() - self.started, 3),
+            'generated': generated,
+            'deduplicated': deduplicated,
+            'hashed': hashed,
+            'keys_per_second': round(self.keys_per_second(), 1),
+        }
+        for stage, durations in self.stages.items():
+            values = np.percentile(np.fromiter(durations, dtype=np.float64), self.PERCENTILES) * 1000
+            for percentile, value in zip(self.PERCENTILES, values):
+                row[f'{stage}_p{percentile}_ms'] = round(float(value), 3)
+        return row
+    
+    def summary(self):
+        """Short text lines for the HUD and the end of a run"""
+        row = self.snapshot()
+        lines = [f"{row['keys_per_second']:,.0f} keys/s - {row['hashed']:,} hashed, "
+                 f"{row['deduplicated']:,} skipped"]
+        lines += [f"{stage}: p50 {row[f'{stage}_p50_ms']:.1f} ms, p99 {row[f'{stage}_p99_ms']:.1f} ms"
+                  for stage in self.stages]
+        return lines
+    
+    def maybe_write(self, force=False):
+        """Append a snapshot to the stats file when the interval has passed"""
+        now = time.perf_counter()
+        if not self.path or (not force and now - self.last_write < self.interval):
+            return
+        self.last_write = now
+        row = self.snapshot()
+        if self.path.endswith('.csv'):
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            if new_file:
+                fieldnames = ['elapsed', 'generated', 'deduplicated', 'hashed', 'keys_per_second']
+                fieldnames += [f'{stage}_p{percentile}_ms'
+                               for stage in self.STAGES for percentile in self.PERCENTILES]
+            else:
+                with open(self.path, newline='') as file:
+                    fieldnames = next(csv.reader(file))
+            with open(self.path, 'a', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=fieldnames, restval='', extrasaction='ignore')
+                if new_file:
+                    writer.writeheader()
+                writer.writerow(row)
+        else:
+            with open(self.path, 'a') as file:
+                file.write(json.dumps(row) + '\n')
 
 
 class BallGame:
     """Main game class"""
     
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, workers=0, search_options=None,
+                 physics_hz=PHYSICS_HZ, fps=FPS, search_budget=0, stats_path=None,
+                 stats_interval=10, hud=False, worlds=1, iterations=None, velocity_range=None,
+                 world_index=0, results=None):
+        if seed is not None:
+            random.seed(seed)
+        self.headless = headless
+        # Matches go to this queue instead of found.txt in a world process
+        self.results = results
+        self.world_index = world_index
+        self.log_prefix = f"[{world_index}] " if world_index or worlds > 1 else ''
+        self.physics_hz = physics_hz
+        self.fps = fps
+        self.stats = Stats(path=stats_path, interval=stats_interval)
+        self.show_hud = hud
+        self.hud_items = []
+        self.hud_updated = 0
         self.clock = pygame.time.Clock()
         self.running = True
         self.score = 0
         self.iteration = 0
         self.found = False
-        self.velocity_range = [-1, 1]
+        self.velocity_range = list(velocity_range or [-1, 1])
         self.balls = []
-        self.hex_manipulator = HexManipulator()
+        self.world = None
+        self.hex_manipulator = HexManipulator(INITIAL_BALL_COUNT)
+        # Keyword arguments of AddressSearcher, shared with the worker processes
+        search_options = dict(search_options or {})
+        if search_options.get('mode', 'address') == 'address':
+            search_options.setdefault('bits', INITIAL_BALL_COUNT)
+            search_options.setdefault('target_address', TARGET_ADDRESS)
+        self.searcher = make_searcher(search_options)
+        # Worker processes for the search, None searches on the main thread
+        self.search_pool = SearchPool(workers, search_options) if workers else None
+        # Main thread search spread over ticks, search_budget milliseconds at a time
+        self.search_scheduler = None
+        if search_budget and not workers and not headless:
+            self.search_scheduler = SearchScheduler(self.searcher, search_budget, self.log_prefix)
+        # The other worlds, this game is world 0
+        self.world_pool = None
+        if worlds > 1:
+            self.world_pool = WorldPool(worlds - 1, seed, search_options, iterations)
         self.music_playing = True
         self.music_loaded = False
         
         # Initialize image loader
         self.image_loader = ImageLoader()
+        self.renderer = None
         
-        # Load images
-        self.load_images()
-        
-        # Try to load background music
-        self.load_music()
+        if not headless:
+            init_display()
+            
+            # Load images
+            self.load_images()
+            self.renderer = Renderer(screen, self.image_loader.background)
+            
+            # Try to load background music
+            self.load_music()
         
         # Create initial balls
         self.reset_balls()
@@ -296,9 +1791,12 @@ class BallGame:
             print("Looking for: ball.png, ball.jpg, etc.")
             self.image_loader.create_default_ball_image()
         
+        self.image_loader.build_sprite_cache()
+        
     def load_music(self):
         """Load background music file"""
         try:
+            pygame.mixer.init()
             # Try to load music file - change filename to your MP3 file
             pygame.mixer.music.load("background.mp3")
             pygame.mixer.music.set_volume(MUSIC_VOLUME)
@@ -335,6 +1833,7 @@ class BallGame:
                 image=self.image_loader.ball_image  # Use the same image for all balls
             )
             self.balls.append(ball)
+        self.world = PhysicsWorld(self.balls)
     
     def update_velocity_range(self):
         """Expand velocity range"""
@@ -346,13 +1845,17 @@ class BallGame:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                self.renderer.full_redraw = True
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_x, mouse_y = event.pos
-                for ball in self.balls:
-                    if ball.handle_click(mouse_x, mouse_y):
-                        self.score += 1
+                self.score += self.world.apply_click(mouse_x, mouse_y)
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
+                if event.key == pygame.K_h:
+                    # Toggle the stats HUD
+                    self.show_hud = not self.show_hud
+                    self.renderer.full_redraw = True
+                elif event.key == pygame.K_SPACE:
                     # Toggle music with spacebar
                     self.toggle_music()
                 elif event.key == pygame.K_UP and self.music_loaded:
@@ -368,61 +1871,70 @@ class BallGame:
     
     def update_physics(self):
         """Update ball positions and handle collisions"""
-        # Update each ball
-        for ball in self.balls:
-            ball.update()
-        
-        # Check collisions between balls
-        for i, ball in enumerate(self.balls):
-            for other in self.balls[i + 1:]:
-                ball.check_collision(other)
+        self.world.step()
     
     def search_bitcoin_address(self):
         """Generate binary string from balls and search for target address"""
         # Generate binary string from ball positions
-        binary_string = ''.join(ball.get_speed_binary() for ball in self.balls)
-        
-        # Try different transformations
-        for invert in range(2):
-            for reverse in range(2):
-                for shift in range(len(binary_string)):
-                    # Convert binary to integer then to hex
-                    try:
-                        decimal_value = int(binary_string, 2)
-                        hex_string = hex(decimal_value)[2:].zfill(len(self.balls) // 4)
-                        
-                        # Try different hex transformations
-                        for hex_shift in range(16):
-                            # Create private key
-                            private_key = int('1' + hex_string, 16)
-                            
-                            # Generate Bitcoin address
-                            address = ice.privatekey_to_address(0, True, private_key)
-                            
-                            # Log first attempt of each iteration
-                            if shift == 0 and reverse == 0 and invert == 0 and hex_shift == 0:
-                                print(f"{self.iteration} - {hex(private_key)[2:]} - {address}")
-                            
-                            # Check if we found the target
-                            if address == TARGET_ADDRESS:
-                                self.found = True
-                                self.log_found_address(private_key, binary_string, address)
-                                return
-                            
-                            # Transform hex string
-                            hex_string = self.hex_manipulator.shift_hex_digits(hex_string)
-                    
-                    except ValueError:
-                        pass
-                    
-                    # Rotate binary string
-                    binary_string = self.hex_manipulator.rotate_left(binary_string, 1)
-                
-                # Reverse binary string
-                binary_string = binary_string[::-1]
-            
-            # Invert binary string
-            binary_string = self.hex_manipulator.invert_binary(binary_string)
+        binary_string = self.world.speed_bits()
+        
+        if self.search_pool:
+            # Hand the frame to the workers and pick up whatever they finished
+            self.search_pool.submit(self.iteration, binary_string)
+            for iteration, frame_binary_string, private_key in self.search_pool.poll():
+                self.report_found(private_key, frame_binary_string)
+            return
+        
+        if self.search_scheduler:
+            # Search for a slice of the tick, carrying the rest of the frame over
+            self.search_scheduler.submit(self.iteration, binary_string)
+            for iteration, frame_binary_string, private_key in self.search_scheduler.run():
+                self.report_found(private_key, frame_binary_string)
+            return
+        
+        private_key = self.searcher.search(binary_string)
+        
+        # Log first attempt of each iteration
+        print(self.log_prefix + self.searcher.log_line(self.iteration))
+        
+        # Check if we found the target
+        if private_key is not None:
+            self.report_found(private_key, binary_string)
+    
+    def report_found(self, private_key, binary_string):
+        """Mark the search as finished and log the match"""
+        self.found = True
+        if self.results is not None:
+            # World process, the parent game logs the match
+            self.results.put(('found', self.world_index, binary_string, private_key))
+            return
+        address = self.searcher.address_of(private_key)
+        self.log_found_address(private_key, binary_string, address)
+    
+    def stop_search_pool(self):
+        """Shut the workers down, keeping any match from frames still in flight"""
+        if not self.search_pool:
+            return
+        for iteration, binary_string, private_key in self.search_pool.close(wait=not self.found):
+            self.report_found(private_key, binary_string)
+        self.stats.count(self.counts())
+        self.search_pool = None
+    
+    def stop_world_pool(self, wait=False):
+        """Shut the other worlds down, or wait for their iteration limit"""
+        if not self.world_pool:
+            return
+        for world_index, binary_string, private_key in self.world_pool.close(wait=wait and not self.found):
+            self.report_found(private_key, binary_string)
+        self.stats.count(self.counts())
+        self.world_pool = None
+    
+    def counts(self):
+        """(generated, deduplicated, hashed) candidates of this game and the other worlds"""
+        counts = (self.search_pool or self.searcher).counts()
+        if self.world_pool:
+            counts = tuple(mine + theirs for mine, theirs in zip(counts, self.world_pool.counts()))
+        return counts
     
     def log_found_address(self, private_key, binary_string, address):
         """Log the found address to file and console"""
@@ -433,22 +1945,19 @@ class BallGame:
         with open('found.txt', 'a') as file:
             file.write(result + '\n')
     
-    def draw(self):
-        """Draw all game elements"""
-        #screen.fill(RED)
-        if self.image_loader.background:
-            screen.blit(self.image_loader.background, (0, 0))
-        else:
-            screen.fill(RED)
+    def draw(self, alpha=1.0):
+        """Draw all game elements, alpha of the way from the previous physics tick"""
         # Draw balls
+        self.world.sync_balls(self.balls, alpha)
+        items = []
         for ball in self.balls:
-            ball.draw(screen)
+            items.extend(ball.blit_items(self.image_loader))
         
         # Draw UI
-        score_text = font.render(f"Score: {self.score}", True, YELLOW)
-        screen.blit(score_text, (1050, 10))
-        score_text = font.render(f"Searching for: {TARGET_ADDRESS}", True, YELLOW)
-        screen.blit(score_text, (10, 10))
+        items.append((self.renderer.score_text(self.score), (1050, 10)))
+        items.append((self.renderer.text(f"Searching for: {self.searcher.label}"), (10, 10)))
+        if self.show_hud:
+            items.extend(self.hud())
         #iteration_text = small_font.render(f"Iteration: {self.iteration}", True, RED)
         #screen.blit(iteration_text, (10, 50))
         
@@ -480,33 +1989,76 @@ class BallGame:
         #    inst_text = small_font.render(instruction, True, RED)
         #    screen.blit(inst_text, (SCREEN_WIDTH - 400, 10 + i * 30))
         
-        pygame.display.flip()
+        self.renderer.draw(items)
+    
+    def hud(self):
+        """Blit items of the stats overlay, re-rendered twice a second"""
+        now = time.perf_counter()
+        if now - self.hud_updated >= 0.5:
+            self.hud_updated = now
+            lines = self.stats.summary()
+            top = SCREEN_HEIGHT - 10 - 22 * len(lines)
+            self.hud_items = [(small_font.render(line, True, YELLOW), (10, top + 22 * i))
+                              for i, line in enumerate(lines)]
+        return self.hud_items
+    
+    def tick(self):
+        """One physics tick, searched"""
+        # Reset balls every 1000 iterations
+        if self.iteration % 1000 == 0 and self.iteration > 0:
+            self.update_velocity_range()
+            self.reset_balls()
+        
+        with self.stats.timer('physics'):
+            self.update_physics()
+        with self.stats.timer('search'):
+            self.search_bitcoin_address()
+        if self.world_pool:
+            for world_index, binary_string, private_key in self.world_pool.poll():
+                self.report_found(private_key, binary_string)
+        self.iteration += 1
+        self.stats.count(self.counts())
+        self.stats.maybe_write()
     
     def run(self):
-        """Main game loop"""
+        """Main game loop
+        
+        Physics ticks at a fixed physics_hz from an accumulator of real time,
+        and every tick is searched. Frames are drawn at up to fps, interpolated
+        between the last two ticks. When ticks cost more than a frame allows,
+        the frame is drawn anyway and the leftover time is dropped.
+        """
+        tick_time = 1.0 / self.physics_hz
+        frame_time = 1.0 / self.fps
+        accumulator = 0.0
+        previous = time.perf_counter()
         while self.running and not self.found:
-            # Reset balls every 1000 iterations
-            if self.iteration % 1000 == 0 and self.iteration > 0:
-                self.update_velocity_range()
-                self.reset_balls()
-            
             # Handle events
-            self.handle_events()
-            
-            # Update physics
-            self.update_physics()
+            with self.stats.timer('events'):
+                self.handle_events()
             
-            # Search for Bitcoin address
-            self.search_bitcoin_address()
+            # Run the physics ticks that are due
+            frame_start = time.perf_counter()
+            self.stats.record('frame', frame_start - previous)
+            accumulator += frame_start - previous
+            previous = frame_start
+            while accumulator >= tick_time and self.running and not self.found:
+                self.tick()
+                accumulator -= tick_time
+                if time.perf_counter() - frame_start >= frame_time:
+                    accumulator %= tick_time
+                    break
             
             # Draw everything
-            self.draw()
+            with self.stats.timer('draw'):
+                self.draw(accumulator / tick_time)
             
             # Control frame rate
-            self.clock.tick(60)
-            
-            # Increment iteration counter
-            self.iteration += 1
+            self.clock.tick(self.fps)
+        
+        self.stop_search_pool()
+        self.stop_world_pool()
+        self.stats.maybe_write(force=True)
         
         # Stop music before quitting
         if self.music_loaded:
@@ -518,12 +2070,146 @@ class BallGame:
             print("Target address found! Check 'found.txt' for details.")
         else:
             print("Game ended without finding target address.")
+    
+    def run_headless(self, max_iterations=None):
+        """Search loop without display, events or frame cap"""
+        while not self.found and (max_iterations is None or self.iteration < max_iterations):
+            self.tick()
+        
+        self.stop_search_pool()
+        self.stop_world_pool(wait=max_iterations is not None)
+        self.stats.maybe_write(force=True)
+        print('\n'.join(self.stats.summary()))
+        pygame.quit()
+        
+        if self.found:
+            print("Target address found! Check 'found.txt' for details.")
+        else:
+            print(f"Stopped after {self.iteration} iterations without finding target address.")
+
+
+def address_formats(value):
+    """Comma separated --formats names"""
+    names = value.split(',')
+    unknown = [name for name in names if name not in ADDRESS_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown address format {', '.join(unknown)}")
+    return names
+
+
+def parse_args(argv=None):
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Bitcoin puzzle visual ball game")
+    parser.add_argument('--headless', action='store_true',
+                        help="run the search without a window, as fast as possible")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="random seed, the same seed gives the same candidates in both modes")
+    parser.add_argument('--iterations', type=int, default=None,
+                        help="stop the headless search after this many iterations")
+    parser.add_argument('--workers', type=int, nargs='?', const=os.cpu_count(), default=0,
+                        help="search on this many worker processes, all cores when no number is given")
+    parser.add_argument('--dedup-size', type=int, default=0,
+                        help="remember this many recently tested keys and skip them")
+    parser.add_argument('--dedup-bloom', action='store_true',
+                        help="remember tested keys in a bloom filter instead of an exact LRU")
+    parser.add_argument('--physics-hz', type=float, default=PHYSICS_HZ,
+                        help="physics ticks (and searched candidate sets) per second in the window")
+    parser.add_argument('--fps', type=float, default=FPS,
+                        help="frame rate cap of the window, independent of the physics rate")
+    parser.add_argument('--search-budget', type=float, default=0, metavar='MS',
+                        help="search at most MS milliseconds per physics tick on the main thread, "
+                             "finishing each frame over later ticks (window without --workers)")
+    parser.add_argument('--stats', default=None, metavar='FILE',
+                        help="append throughput and stage timings to FILE (.csv, or JSON lines)")
+    parser.add_argument('--stats-interval', type=float, default=10,
+                        help="seconds between --stats snapshots")
+    parser.add_argument('--hud', action='store_true',
+                        help="show the stats overlay in the window from the start (H toggles it)")
+    parser.add_argument('--worlds', type=int, default=1,
+                        help="run this many independent games, each with its own seed and velocity "
+                             "schedule, the extra ones headless on their own processes")
+    parser.add_argument('--threads', type=int, default=1,
+                        help="native threads per search process for hashing and the target bloom filter")
+    parser.add_argument('--radius', type=int, default=0,
+                        help="also hash the keys up to this far below and above every candidate")
+    parser.add_argument('--formats', type=address_formats, default=['compressed'],
+                        help="comma separated address formats derived from every key: "
+                             + ', '.join(ADDRESS_FORMATS))
+    parser.add_argument('--pubkey', default=None, metavar='HEX',
+                        help="BSGS search for this public key, each frame sweeps a window of "
+                             "giant steps * baby steps keys")
+    parser.add_argument('--kangaroo', action='store_true',
+                        help="search for --pubkey with a kangaroo herd instead of BSGS")
+    parser.add_argument('--puzzle-bits', type=int, default=PUZZLE_BITS,
+                        help="bit length of the --pubkey private key, the range is [2^(bits-1), 2^bits)")
+    parser.add_argument('--herd', type=int, default=KANGAROO_HERD,
+                        help="kangaroos jumping together, half tame and half wild")
+    parser.add_argument('--dp-bits', type=int, default=None,
+                        help="zero low bits of x that make a distinguished point (default from range and herd)")
+    parser.add_argument('--kangaroo-store', default=None, metavar='FILE',
+                        help="distinguished point file, kept between runs (default kangaroo_<x>_<bits>_<jumps>_<dp>.dp)")
+    parser.add_argument('--baby-steps', type=int, default=BSGS_BABY_STEPS,
+                        help="keys covered by one BSGS giant step, the size of the baby step bloom")
+    parser.add_argument('--giant-steps', type=int, default=BSGS_GIANT_STEPS,
+                        help="BSGS giant steps per frame")
+    parser.add_argument('--bsgs-bloom', default=None, metavar='FILE',
+                        help="baby step bloom file, built on first use (default bsgs_<baby steps>.bloom)")
+    parser.add_argument('--targets', default=None, metavar='FILE',
+                        help="search for every address (or hash160 hex) listed in FILE, one per line")
+    return parser.parse_args(argv)
+
+
+def search_options(args):
+    """AddressSearcher or BsgsSearcher keyword arguments from the command line"""
+    if args.pubkey and args.kangaroo:
+        return {
+            'mode': 'kangaroo',
+            'pubkey': args.pubkey,
+            'bits': args.puzzle_bits,
+            'herd': args.herd,
+            'dp_bits': args.dp_bits,
+            'store_file': args.kangaroo_store,
+        }
+    if args.pubkey:
+        return {
+            'mode': 'bsgs',
+            'pubkey': args.pubkey,
+            'bits': args.puzzle_bits,
+            'baby_steps': args.baby_steps,
+            'giant_steps': args.giant_steps,
+            'bloom_file': args.bsgs_bloom,
+            'threads': args.threads,
+        }
+    return {
+        'dedup_size': args.dedup_size,
+        'dedup_bloom': args.dedup_bloom,
+        'targets_file': args.targets,
+        'threads': args.threads,
+        'radius': args.radius,
+        'formats': args.formats,
+    }
+
+
+def headless_main(argv=None):
+    """Entry point for display-less machines"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    main(['--headless'] + argv)
 
 
-def main():
+def main(argv=None):
     """Entry point"""
-    game = BallGame()
-    game.run()
+    args = parse_args(argv)
+    if args.headless:
+        game = BallGame(headless=True, seed=args.seed, workers=args.workers,
+                        search_options=search_options(args), stats_path=args.stats,
+                        stats_interval=args.stats_interval, worlds=args.worlds, iterations=args.iterations)
+        game.run_headless(args.iterations)
+    else:
+        game = BallGame(seed=args.seed, workers=args.workers, search_options=search_options(args),
+                        physics_hz=args.physics_hz, fps=args.fps, search_budget=args.search_budget,
+                        stats_path=args.stats, stats_interval=args.stats_interval, hud=args.hud,
+                        worlds=args.worlds)
+        game.run()
 
 
 if __name__ == "__main__":